@@ -1,12 +1,46 @@
 """
 Admin configuration for custom User model
 """
+from datetime import timedelta
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.utils import timezone
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from accounts.models import User
 
 
+AVATAR_PREVIEW_HTML = '<img src="{}" width="30" height="30" style="border-radius: 50%;" />'
+NO_AVATAR_HTML = mark_safe(
+    '<div style="width: 30px; height: 30px; background-color: #ddd; '
+    'border-radius: 50%; display: flex; align-items: center; '
+    'justify-content: center; font-size: 12px;">No</div>'
+)
+
+
+class DateJoinedFilter(admin.SimpleListFilter):
+    """Fixed date_joined buckets, each a single range condition"""
+    title = 'date joined'
+    parameter_name = 'joined'
+    
+    # lookup value -> days back from now
+    PERIODS = {'24h': 1, '7d': 7, '30d': 30}
+    
+    def lookups(self, request, model_admin):
+        return [
+            ('24h', 'Last 24 hours'),
+            ('7d', 'Last 7 days'),
+            ('30d', 'Last 30 days'),
+        ]
+    
+    def queryset(self, request, queryset):
+        days = self.PERIODS.get(self.value())
+        if days is None:
+            return queryset
+        return queryset.filter(date_joined__gte=timezone.now() - timedelta(days=days))
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """
@@ -17,7 +51,7 @@ class UserAdmin(BaseUserAdmin):
         'phone', 'is_verified', 'is_staff', 'date_joined'
     ]
     list_filter = [
-        'is_staff', 'is_superuser', 'is_active', 'is_verified', 'date_joined'
+        'is_staff', 'is_superuser', 'is_active', 'is_verified', DateJoinedFilter
     ]
     search_fields = ['username', 'email', 'first_name', 'last_name', 'phone']
     ordering = ['-date_joined']
@@ -36,22 +70,21 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        """Compute full name in SQL so it can also be sorted on"""
+        return super().get_queryset(request).annotate(
+            full_name_db=User.full_name_expression()
+        )
+    
     def avatar_preview(self, obj):
         """Display avatar preview in list"""
         if obj.avatar:
-            return format_html(
-                '<img src="{}" width="30" height="30" style="border-radius: 50%;" />',
-                obj.avatar.url
-            )
-        return format_html(
-            '<div style="width: 30px; height: 30px; background-color: #ddd; '
-            'border-radius: 50%; display: flex; align-items: center; '
-            'justify-content: center; font-size: 12px;">No</div>'
-        )
+            return format_html(AVATAR_PREVIEW_HTML, obj.avatar.url)
+        return NO_AVATAR_HTML
     avatar_preview.short_description = 'Avatar'
     
     def full_name(self, obj):
         """Display full name"""
-        return obj.full_name
+        return obj.full_name_db
     full_name.short_description = 'Full Name'
-    full_name.admin_order_field = 'first_name'
+    full_name.admin_order_field = 'full_name_db'
@@ -3,6 +3,8 @@ Custom User model for Organic Green e-commerce
 """
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Concat
 
 
 class User(AbstractUser):
@@ -44,6 +46,13 @@ class User(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         db_table = 'auth_user'  # Keep same table name to avoid migration issues
+        indexes = [
+            # Admin list default ordering and phone search
+            models.Index(fields=['-date_joined']),
+            models.Index(fields=['phone']),
+            # Activity stats filter on recent logins
+            models.Index(fields=['last_login']),
+        ]
     
     @property
     def full_name(self):
@@ -56,6 +65,17 @@ class User(AbstractUser):
             return self.last_name
         return self.username
     
+    @staticmethod
+    def full_name_expression():
+        """SQL equivalent of `full_name`, for annotating querysets"""
+        return Case(
+            When(first_name='', last_name='', then=F('username')),
+            When(last_name='', then=F('first_name')),
+            When(first_name='', then=F('last_name')),
+            default=Concat('first_name', Value(' '), 'last_name'),
+            output_field=CharField(),
+        )
+    
     @property
     def display_name(self):
         """Get display name for UI"""
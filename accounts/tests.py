@@ -1,3 +1,19 @@
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+
+
+class FullNameExpressionTest(TestCase):
+    """full_name_expression() must agree with the full_name property"""
+
+    def test_matches_property(self):
+        names = [('Ali', 'Valiyev'), ('Ali', ''), ('', 'Valiyev'), ('', '')]
+        for i, (first_name, last_name) in enumerate(names):
+            User.objects.create_user(
+                username=f'user{i}', password='pass123',
+                first_name=first_name, last_name=last_name,
+            )
+
+        users = User.objects.annotate(full_name_db=User.full_name_expression())
+        for user in users:
+            self.assertEqual(user.full_name_db, user.full_name)
@@ -1,9 +1,30 @@
 """
 Admin Serializers
 Enhanced serializers with detailed information for admin interfaces
+
+Querysets each serializer expects (see api/admin_views.py):
+    ObjectCountField        annotated by BaseAdminViewSet.get_queryset_annotations
+    UserAdminSerializer     total_spent and full_name_db annotations
+    UserDetailAdminSerializer
+                            Prefetch to recent_orders_list / recent_favorites_list
+    ProductAdminSerializer  select_related('category'), prefetch_related('images')
+    ProductDetailAdminSerializer
+                            total_sold and revenue_generated annotations
+    OrderAdminSerializer    select_related('user')
+    OrderDetailAdminSerializer
+                            Prefetch('items', OrderItem.objects.select_related('product'))
+    CartAdminSerializer     select_related('user'), total_value annotation
+    FavoriteAdminSerializer select_related('user', 'product')
 """
+import copy
+import operator
+from collections.abc import Mapping
+
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 from accounts.models import User  # Use custom user model with extra fields
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.db.models import Sum, Count, Avg
 from django.utils import timezone
 from datetime import timedelta
@@ -16,31 +37,235 @@ from apps.franchise.models import FranchiseApplication
 from apps.cart.models import Cart, CartItem
 from apps.favorites.models import Favorite
 
+from api.utils import count_related
+
+# Display format for *_formatted timestamps
+DATETIME_DISPLAY_FORMAT = '%d.%m.%Y %H:%M'
+
+# Renders money in hand-built dicts the same way DecimalField columns do
+MONEY_FIELD = serializers.DecimalField(max_digits=15, decimal_places=2)
+
+
+# ===== BASE CLASSES =====
+
+class AnnotatedFieldMixin:
+    """
+    Read-only field rendered from a queryset annotation. A missing
+    annotation raises ImproperlyConfigured; plain DRF would treat the
+    non-required field as skipped and drop its key from the response.
+    """
+    # Only a miss differs from Field.get_attribute, so _compile_representation
+    # may still read the attribute directly
+    compiled_getattr = True
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if isinstance(instance, Mapping):
+            return super().get_attribute(instance)
+        try:
+            return getattr(instance, self.source)
+        except AttributeError:
+            raise ImproperlyConfigured(
+                f"{type(self.parent).__name__}.{self.field_name} needs the "
+                f"'{self.source}' annotation on the queryset"
+            ) from None
+
+
+class ObjectCountField(AnnotatedFieldMixin, serializers.IntegerField):
+    """
+    Read-only count of objects related to the serialized instance.
+
+    The value is not computed here: BaseAdminViewSet annotates it on the
+    queryset, and only when the field survives `?fields=` limiting.
+    """
+
+    def __init__(self, model, related_field, filters=None, **kwargs):
+        self.model = model
+        self.related_field = related_field
+        self.filters = filters or {}
+        super().__init__(**kwargs)
+
+    def get_annotation(self):
+        """Expression annotated on the queryset under the field's source"""
+        return count_related(self.model, self.related_field, **self.filters)
+
+
+class AnnotatedIntegerField(AnnotatedFieldMixin, serializers.IntegerField):
+    pass
+
+
+class AnnotatedDecimalField(AnnotatedFieldMixin, serializers.DecimalField):
+    pass
+
+
+class AttrGetterFieldMixin:
+    """
+    Resolve a dotted `source` with an attrgetter compiled once at bind time
+    instead of DRF's per-row attribute walk. Anything unusual (a dict
+    instance, a callable, a broken chain) falls back to Field.get_attribute
+    so defaults, nulls and SkipField behave exactly as before.
+    """
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self._attrgetter = operator.attrgetter(self.source)
+
+    def get_attribute(self, instance):
+        if isinstance(instance, Mapping):
+            return super().get_attribute(instance)
+        try:
+            value = self._attrgetter(instance)
+        except ObjectDoesNotExist:
+            return None
+        except (KeyError, AttributeError):
+            return super().get_attribute(instance)
+        if callable(value):
+            return super().get_attribute(instance)
+        return value
+
+
+class AttrCharField(AttrGetterFieldMixin, serializers.CharField):
+    pass
+
+
+class AttrDecimalField(AttrGetterFieldMixin, serializers.DecimalField):
+    pass
+
+
+def _copy_field(field):
+    """Copy a cached, unbound field for use by one serializer instance"""
+    # These bind their child to themselves on init, so a shallow copy would
+    # share that child across instances; deepcopy re-instantiates it instead
+    if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField,
+                          serializers.ListField, serializers.DictField)):
+        return copy.deepcopy(field)
+    return copy.copy(field)
+
+
+_MISSING = object()
+
+
+def _represent_field(field, instance, ret):
+    """DRF's per-field step of Serializer.to_representation"""
+    try:
+        attribute = field.get_attribute(instance)
+    except SkipField:
+        return
+    check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+    ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+
+
+def _compile_representation(fields):
+    """
+    Build a straight-line `represent(instance, fields)` for these fields.
+
+    Fields with a plain one-step source read it with getattr and call
+    to_representation directly. A missing or callable attribute, and every
+    other kind of field, goes through _represent_field.
+    """
+    lines = ['def represent(instance, fields):']
+    if fields:
+        lines.append('    %s, = fields' % ', '.join(f'f{i}' for i in range(len(fields))))
+    lines.append('    ret = {}')
+    for i, field in enumerate(fields):
+        name = field.field_name
+        plain_getattr = (type(field).get_attribute is serializers.Field.get_attribute
+                         or getattr(field, 'compiled_getattr', False))
+        if plain_getattr and len(field.source_attrs) == 1:
+            lines += [
+                f'    value = getattr(instance, {field.source_attrs[0]!r}, MISSING)',
+                '    if value is MISSING or callable(value):',
+                f'        represent_field(f{i}, instance, ret)',
+                '    elif value is None:',
+                f'        ret[{name!r}] = None',
+                '    else:',
+                f'        ret[{name!r}] = f{i}.to_representation(value)',
+            ]
+        else:
+            lines.append(f'    represent_field(f{i}, instance, ret)')
+    lines.append('    return ret')
+
+    namespace = {'MISSING': _MISSING, 'represent_field': _represent_field}
+    exec('\n'.join(lines), namespace)
+    return namespace['represent']
+
+
+class AdminModelSerializer(serializers.ModelSerializer):
+    """
+    Base admin serializer.
+    GET requests may pass `?fields=id,name_uz` to render only those fields.
+    """
+    # Unbound fields per serializer class, built by the first get_fields() call
+    _fields_cache = {}
+    # Compiled represent() functions per class and readable field layout
+    _representation_cache = {}
+
+    def get_fields(self):
+        """Introspect the model once per class, return fresh copies per instance"""
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {
+            name: _copy_field(field)
+            for name, field in self._fields_cache[cls].items()
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get('fields')
+        if requested:
+            allowed = {name.strip() for name in requested.split(',')}
+            for field_name in set(self.fields) - allowed:
+                self.fields.pop(field_name)
+
+    def to_representation(self, instance):
+        """Same output as DRF's loop, via a function compiled per field layout"""
+        if isinstance(instance, Mapping):
+            return super().to_representation(instance)
+        try:
+            represent, fields = self._compiled_representation
+        except AttributeError:
+            fields = tuple(self._readable_fields)
+            key = (type(self),) + tuple(
+                (field.field_name, type(field), tuple(field.source_attrs)) for field in fields
+            )
+            if key not in self._representation_cache:
+                self._representation_cache[key] = _compile_representation(fields)
+            represent = self._representation_cache[key]
+            self._compiled_representation = represent, fields
+        return represent(instance, fields)
+
 
 # ===== USER SERIALIZERS =====
 
-class UserAdminSerializer(serializers.ModelSerializer):
+class UserAdminSerializer(AdminModelSerializer):
     """Basic admin serializer for Users"""
-    orders_count = serializers.SerializerMethodField()
-    total_spent = serializers.SerializerMethodField()
+    orders_count = ObjectCountField(Order, 'user')
+    # Annotated by UserAdminViewSet.get_queryset_annotations
+    total_spent = AnnotatedDecimalField(max_digits=15, decimal_places=2)
+    full_name = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = [
-            'id', 'username', 'email', 'first_name', 'last_name', 
+            'id', 'username', 'email', 'first_name', 'last_name', 'full_name',
             'is_active', 'is_staff', 'is_superuser', 'date_joined',
             'last_login', 'orders_count', 'total_spent'
         ]
         read_only_fields = ['id', 'date_joined', 'last_login']
     
-    def get_orders_count(self, obj):
-        """Get user's orders count"""
-        return obj.orders.count()
-    
-    def get_total_spent(self, obj):
-        """Get total amount spent by user"""
-        total = obj.orders.aggregate(total=Sum('total_price'))['total']
-        return float(total) if total else 0.0
+    def get_full_name(self, obj):
+        """Use the full_name_db annotation when the viewset provided it"""
+        full_name = getattr(obj, 'full_name_db', None)
+        if full_name is None:
+            full_name = obj.full_name
+        return full_name
 
 
 class UserDetailAdminSerializer(UserAdminSerializer):
@@ -58,18 +283,24 @@ class UserDetailAdminSerializer(UserAdminSerializer):
     
     def get_recent_orders(self, obj):
         """Get recent orders (last 5)"""
-        orders = obj.orders.order_by('-created_at')[:5]
+        # Prefetched by UserAdminViewSet.get_queryset on retrieve
+        orders = getattr(obj, 'recent_orders_list', None)
+        if orders is None:
+            orders = obj.orders.order_by('-created_at')[:5]
         return [{
             'id': str(order.id),
             'order_number': order.order_number,
-            'total_price': float(order.total_price),
+            'total_price': MONEY_FIELD.to_representation(order.total_price),
             'status': order.status,
             'created_at': order.created_at.isoformat()
         } for order in orders]
     
     def get_recent_favorites(self, obj):
         """Get recent favorites (last 5)"""
-        favorites = obj.favorites.select_related('product').order_by('-created_at')[:5]
+        # Prefetched by UserAdminViewSet.get_queryset on retrieve
+        favorites = getattr(obj, 'recent_favorites_list', None)
+        if favorites is None:
+            favorites = obj.favorites.select_related('product').order_by('-created_at')[:5]
         return [{
             'product_id': str(fav.product.id),
             'product_name': fav.product.name_uz,
@@ -91,7 +322,7 @@ class UserDetailAdminSerializer(UserAdminSerializer):
 
 # ===== PRODUCT SERIALIZERS =====
 
-class ProductImageReadAdminSerializer(serializers.ModelSerializer):
+class ProductImageReadAdminSerializer(AdminModelSerializer):
     """Read-only serializer for Product Images (admin)"""
     image_url = serializers.SerializerMethodField()
 
@@ -112,7 +343,7 @@ class ProductImageReadAdminSerializer(serializers.ModelSerializer):
         return None
 
 
-class ProductImageWriteAdminSerializer(serializers.ModelSerializer):
+class ProductImageWriteAdminSerializer(AdminModelSerializer):
     """Write serializer for creating product images together with product"""
     class Meta:
         model = ProductImage
@@ -121,11 +352,11 @@ class ProductImageWriteAdminSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProductAdminSerializer(serializers.ModelSerializer):
+class ProductAdminSerializer(AdminModelSerializer):
     """Basic admin serializer for Products"""
-    category_name = serializers.CharField(source='category.name_uz', read_only=True)
-    orders_count = serializers.SerializerMethodField()
-    favorites_count = serializers.SerializerMethodField()
+    category_name = AttrCharField(source='category.name_uz', read_only=True)
+    orders_count = ObjectCountField(OrderItem, 'product')
+    favorites_count = ObjectCountField(Favorite, 'product')
     images = ProductImageWriteAdminSerializer(many=True, write_only=True, required=False, help_text="Mahsulot yaratishda bir nechta rasm yuborish uchun")
     images_list = ProductImageReadAdminSerializer(source='images', many=True, read_only=True)
     primary_image_url = serializers.SerializerMethodField()
@@ -142,14 +373,6 @@ class ProductAdminSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'orders_count', 'favorites_count', 'image_count']
     
-    def get_orders_count(self, obj):
-        """Get how many times this product was ordered"""
-        return obj.order_items.count()
-    
-    def get_favorites_count(self, obj):
-        """Get how many users favorited this product"""
-        return obj.favorited_by.count()
-    
     def create(self, validated_data):
         images_data = validated_data.pop('images', [])
         product = super().create(validated_data)
@@ -180,8 +403,9 @@ class ProductAdminSerializer(serializers.ModelSerializer):
 
 class ProductDetailAdminSerializer(ProductAdminSerializer):
     """Detailed admin serializer for Products with comprehensive statistics"""
-    total_sold = serializers.SerializerMethodField()
-    revenue_generated = serializers.SerializerMethodField()
+    # Annotated by ProductAdminViewSet.get_queryset_annotations
+    total_sold = AnnotatedIntegerField()
+    revenue_generated = AnnotatedDecimalField(max_digits=15, decimal_places=2)
     recent_orders = serializers.SerializerMethodField()
     stock_status = serializers.SerializerMethodField()
     
@@ -190,18 +414,6 @@ class ProductDetailAdminSerializer(ProductAdminSerializer):
             'total_sold', 'revenue_generated', 'recent_orders', 'stock_status'
         ]
     
-    def get_total_sold(self, obj):
-        """Get total quantity sold"""
-        total = obj.order_items.aggregate(total=Sum('quantity'))['total']
-        return total if total else 0
-    
-    def get_revenue_generated(self, obj):
-        """Get total revenue from this product"""
-        total = obj.order_items.aggregate(
-            total=Sum('total_price')
-        )['total']
-        return float(total) if total else 0.0
-    
     def get_recent_orders(self, obj):
         """Get recent orders for this product (last 5)"""
         recent_items = obj.order_items.select_related('order').order_by('-order__created_at')[:5]
@@ -209,7 +421,7 @@ class ProductDetailAdminSerializer(ProductAdminSerializer):
             'order_id': str(item.order.id),
             'order_number': item.order.order_number,
             'quantity': item.quantity,
-            'price': float(item.total_price),
+            'price': MONEY_FIELD.to_representation(item.total_price),
             'created_at': item.order.created_at.isoformat()
         } for item in recent_items]
     
@@ -223,9 +435,11 @@ class ProductDetailAdminSerializer(ProductAdminSerializer):
             return "In Stock"
 
 
-class ProductCategoryAdminSerializer(serializers.ModelSerializer):
+class ProductCategoryAdminSerializer(AdminModelSerializer):
     """Admin serializer for Product Categories"""
-    products_count = serializers.SerializerMethodField()
+    products_count = ObjectCountField(
+        Product, 'category', filters={'is_active': True, 'deleted_at__isnull': True}
+    )
     
     class Meta:
         model = ProductCategory
@@ -235,15 +449,13 @@ class ProductCategoryAdminSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_products_count(self, obj):
-        """Get products count in this category"""
-        return obj.products.filter(is_active=True, deleted_at__isnull=True).count()
 
 
-class ProductTagAdminSerializer(serializers.ModelSerializer):
+class ProductTagAdminSerializer(AdminModelSerializer):
     """Admin serializer for Product Tags"""
-    products_count = serializers.SerializerMethodField()
+    products_count = ObjectCountField(
+        Product, 'tags', filters={'is_active': True, 'deleted_at__isnull': True}
+    )
     
     class Meta:
         model = ProductTag
@@ -252,17 +464,13 @@ class ProductTagAdminSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_products_count(self, obj):
-        """Get products count with this tag"""
-        return obj.products.filter(is_active=True, deleted_at__isnull=True).count()
 
 
 # ===== ORDER SERIALIZERS =====
 
-class OrderItemAdminSerializer(serializers.ModelSerializer):
+class OrderItemAdminSerializer(AdminModelSerializer):
     """Admin serializer for Order Items"""
-    product_name = serializers.CharField(source='product.name_uz', read_only=True)
+    product_name = AttrCharField(source='product.name_uz', read_only=True)
     
     class Meta:
         model = OrderItem
@@ -271,10 +479,10 @@ class OrderItemAdminSerializer(serializers.ModelSerializer):
         ]
 
 
-class OrderAdminSerializer(serializers.ModelSerializer):
+class OrderAdminSerializer(AdminModelSerializer):
     """Basic admin serializer for Orders"""
-    user_email = serializers.CharField(source='user.email', read_only=True)
-    items_count = serializers.SerializerMethodField()
+    user_email = AttrCharField(source='user.email', read_only=True)
+    items_count = ObjectCountField(OrderItem, 'order')
     
     class Meta:
         model = Order
@@ -284,10 +492,6 @@ class OrderAdminSerializer(serializers.ModelSerializer):
             'total_price', 'items_count', 'notes', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'order_number', 'created_at', 'updated_at']
-    
-    def get_items_count(self, obj):
-        """Get order items count"""
-        return obj.items.count()
 
 
 class OrderDetailAdminSerializer(OrderAdminSerializer):
@@ -300,10 +504,12 @@ class OrderDetailAdminSerializer(OrderAdminSerializer):
 
 # ===== APPLICATION SERIALIZERS =====
 
-class CourseApplicationAdminSerializer(serializers.ModelSerializer):
+class CourseApplicationAdminSerializer(AdminModelSerializer):
     """Admin serializer for Course Applications"""
     status_display = serializers.SerializerMethodField()
-    created_at_formatted = serializers.SerializerMethodField()
+    created_at_formatted = serializers.DateTimeField(
+        source='created_at', format=DATETIME_DISPLAY_FORMAT, read_only=True
+    )
     application_age = serializers.SerializerMethodField()
     
     class Meta:
@@ -319,21 +525,20 @@ class CourseApplicationAdminSerializer(serializers.ModelSerializer):
         """Get human readable status"""
         return "Qayta ishlangan" if obj.processed else "Kutilmoqda"
     
-    def get_created_at_formatted(self, obj):
-        """Get formatted creation date"""
-        return obj.created_at.strftime('%d.%m.%Y %H:%M')
-    
     def get_application_age(self, obj):
         """Get application age in days"""
         diff = timezone.now() - obj.created_at
         return diff.days
 
 
-class FranchiseApplicationAdminSerializer(serializers.ModelSerializer):
+class FranchiseApplicationAdminSerializer(AdminModelSerializer):
     """Admin serializer for Franchise Applications"""
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    created_at_formatted = serializers.SerializerMethodField()
-    investment_amount_formatted = serializers.SerializerMethodField()
+    created_at_formatted = serializers.DateTimeField(
+        source='created_at', format=DATETIME_DISPLAY_FORMAT, read_only=True
+    )
+    # Kept as an alias of formatted_investment_amount for existing clients
+    investment_amount_formatted = serializers.CharField(source='formatted_investment_amount', read_only=True)
     is_pending = serializers.ReadOnlyField()
     is_approved = serializers.ReadOnlyField()
     formatted_investment_amount = serializers.ReadOnlyField()
@@ -348,23 +553,16 @@ class FranchiseApplicationAdminSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_created_at_formatted(self, obj):
-        """Get formatted creation date"""
-        return obj.created_at.strftime('%d.%m.%Y %H:%M')
-    
-    def get_investment_amount_formatted(self, obj):
-        """Get formatted investment amount"""
-        return f"${obj.investment_amount:,.2f}"
 
 
 # ===== CART & FAVORITES SERIALIZERS =====
 
-class CartAdminSerializer(serializers.ModelSerializer):
+class CartAdminSerializer(AdminModelSerializer):
     """Admin serializer for Cart"""
-    user_email = serializers.CharField(source='user.email', read_only=True)
-    items_count = serializers.SerializerMethodField()
-    total_value = serializers.SerializerMethodField()
+    user_email = AttrCharField(source='user.email', read_only=True)
+    items_count = ObjectCountField(CartItem, 'cart')
+    # Annotated by CartAdminViewSet.get_queryset_annotations
+    total_value = AnnotatedDecimalField(max_digits=15, decimal_places=2)
     
     class Meta:
         model = Cart
@@ -373,22 +571,13 @@ class CartAdminSerializer(serializers.ModelSerializer):
             'total_value', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def get_items_count(self, obj):
-        """Get cart items count"""
-        return obj.items.count()
-    
-    def get_total_value(self, obj):
-        """Get total cart value"""
-        total = sum(item.quantity * item.product.final_price for item in obj.items.all())
-        return float(total)
 
 
-class FavoriteAdminSerializer(serializers.ModelSerializer):
+class FavoriteAdminSerializer(AdminModelSerializer):
     """Admin serializer for Favorites"""
-    user_email = serializers.CharField(source='user.email', read_only=True)
-    product_name = serializers.CharField(source='product.name_uz', read_only=True)
-    product_price = serializers.DecimalField(source='product.final_price', read_only=True, max_digits=15, decimal_places=2)
+    user_email = AttrCharField(source='user.email', read_only=True)
+    product_name = AttrCharField(source='product.name_uz', read_only=True)
+    product_price = AttrDecimalField(source='product.final_price', read_only=True, max_digits=15, decimal_places=2)
     
     class Meta:
         model = Favorite
@@ -397,3 +586,19 @@ class FavoriteAdminSerializer(serializers.ModelSerializer):
             'product_price', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
+
+
+# ===== SUMMARY SERIALIZERS =====
+
+class AdminSummarySerializer(serializers.Serializer):
+    """Headline counts for the admin summary endpoint"""
+    total_users = serializers.IntegerField()
+    verified_users = serializers.IntegerField()
+    staff_users = serializers.IntegerField()
+    total_orders = serializers.IntegerField()
+    pending_orders = serializers.IntegerField()
+    delivered_orders = serializers.IntegerField()
+    total_products = serializers.IntegerField()
+    active_products = serializers.IntegerField()
+    featured_products = serializers.IntegerField()
+    out_of_stock = serializers.IntegerField()
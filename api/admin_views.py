@@ -2,12 +2,21 @@
 Admin API Views - Complete admin interface for all project entities
 """
 from decimal import Decimal
-from django.db.models import Sum, Count, Q, F
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Sum, Count, Avg, Max, Q, F, Prefetch, Case, When, DecimalField, ExpressionWrapper, Exists, OuterRef,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from datetime import datetime, timedelta
@@ -15,14 +24,18 @@ from datetime import datetime, timedelta
 # Models
 from accounts.models import User
 from apps.products.models import Product, ProductCategory, ProductTag, ProductImage
-from apps.order.models import Order, OrderItem
+from apps.order.models import Order, OrderItem, OrderDailyRollup
 from apps.course.models import Application as CourseApplication
 from apps.franchise.models import FranchiseApplication
 from apps.cart.models import Cart, CartItem
 from apps.favorites.models import Favorite
 
+from api.pagination import AdminPagination, AdminCursorPagination, EstimatedCountPagination
+from api.utils import csv_lines, sum_related
+
 # Serializers
 from api.admin_serializers import (
+    ObjectCountField,
     UserAdminSerializer,
     UserDetailAdminSerializer,
     ProductAdminSerializer,
@@ -36,15 +49,143 @@ from api.admin_serializers import (
     FranchiseApplicationAdminSerializer,
     CartAdminSerializer,
     FavoriteAdminSerializer,
+    AdminSummarySerializer,
 )
 
+# Dashboard payloads are served from the cache for this many seconds
+DASHBOARD_CACHE_TIMEOUT = 60
+# Top-N rankings change slowly and are cached longer
+POPULAR_CACHE_TIMEOUT = 60 * 5
+# Stats endpoints return flat numbers; skip the browsable API renderer
+STATS_RENDERER_CLASSES = [JSONRenderer]
+# 409 body when one_primary_image_per_product rejects a concurrent primary change
+PRIMARY_IMAGE_CONFLICT = 'Asosiy rasm boshqa so\'rov tomonidan o\'zgartirildi, qayta urinib ko\'ring.'
+
 
 class BaseAdminViewSet(viewsets.ModelViewSet):
     """Base admin viewset with common configurations"""
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = AdminPagination
+    # Used instead of pagination_class when the request carries `?cursor=`
+    cursor_pagination_class = None
+    # Load only the columns the list serializer reads. Enable only where every
+    # SerializerMethodField/property sticks to those columns or prefetches.
+    list_only_serializer_fields = False
+    # Rows fetched per round trip when streaming `?export=csv`
+    export_chunk_size = 2000
     # ordering = ['-created_at']
     
+    def get_queryset(self):
+        """
+        Paginated lists get the annotations per page from the paginator,
+        so the row count runs on the plain queryset
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list' and self.list_only_serializer_fields:
+            queryset = queryset.only(*self.get_serializer_columns(queryset))
+        if self.action == 'list' and self.paginator is not None and not self.is_csv_export():
+            return queryset
+        return self.get_queryset_annotations(queryset)
+    
+    def is_csv_export(self):
+        """Whether this list request asked for the `?export=csv` stream"""
+        return self.request is not None and self.request.query_params.get('export') == 'csv'
+    
+    def list(self, request, *args, **kwargs):
+        """`?export=csv` streams the whole filtered list instead of a page"""
+        if self.is_csv_export():
+            return self.export_csv(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+    
+    def export_csv(self, queryset):
+        """
+        Stream `queryset` as CSV through the list serializer. Rows are read
+        with iterator() (a server-side cursor on PostgreSQL), so memory stays
+        flat however many rows match. Nested serializer fields are left out and
+        fields a row skips are written as empty cells.
+        """
+        serializer = self.get_serializer()
+        columns = [
+            name for name, field in serializer.fields.items()
+            if not field.write_only and not isinstance(field, BaseSerializer)
+        ]
+        
+        def rows():
+            for instance in queryset.iterator(chunk_size=self.export_chunk_size):
+                data = serializer.to_representation(instance)
+                yield [data.get(column, '') for column in columns]
+        
+        response = StreamingHttpResponse(csv_lines(columns, rows()), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.csv"'
+        return response
+    
+    @property
+    def paginator(self):
+        """The paginator instance, keyset based for `?cursor=` requests"""
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.pagination_class
+            if (
+                self.cursor_pagination_class is not None
+                and self.request is not None
+                and self.cursor_pagination_class.cursor_query_param in self.request.query_params
+            ):
+                pagination_class = self.cursor_pagination_class
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
+    
+    def get_serializer_columns(self, queryset):
+        """
+        Local concrete fields read by the full list serializer, plus the pk
+        and every FK that select_related follows. `?fields=` is ignored here:
+        a narrowed column set would defer FKs that select_related still
+        traverses, and columns the remaining properties read.
+        """
+        model = queryset.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        # No request in the context, so AdminModelSerializer keeps every field
+        serializer = self.get_serializer_class()(context={'view': self})
+        for field in serializer.fields.values():
+            if field.write_only or not field.source_attrs:
+                continue
+            # Dotted sources keep their FK so select_related still applies
+            if field.source_attrs[0] in concrete:
+                columns.add(field.source_attrs[0])
+        if isinstance(queryset.query.select_related, dict):
+            columns.update(queryset.query.select_related)
+        return columns
+    
+    def get_queryset_annotations(self, queryset):
+        """Annotations needed to render the current serializer"""
+        return self.annotate_object_counts(queryset)
+    
+    def annotate_object_counts(self, queryset):
+        """Annotate every ObjectCountField left after `?fields=` limiting"""
+        annotations = {
+            field.source: field.get_annotation()
+            for field in self.get_serializer().fields.values()
+            if isinstance(field, ObjectCountField)
+        }
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+    
+    def perform_create(self, serializer):
+        serializer.save()
+        self.reload_instance(serializer)
+    
+    def perform_update(self, serializer):
+        serializer.save()
+        self.reload_instance(serializer)
+    
+    def reload_instance(self, serializer):
+        """
+        Re-read the saved instance through get_queryset(), so create and
+        update responses carry the same annotations as retrieve
+        """
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
+    
     def perform_destroy(self, instance):
         """Soft delete implementation"""
         if hasattr(instance, 'deleted_at'):
@@ -60,8 +201,12 @@ class BaseAdminViewSet(viewsets.ModelViewSet):
 
 class UserAdminViewSet(BaseAdminViewSet):
     """Admin CRUD for Users"""
+    # Related rows are prefetched per action in get_queryset
     queryset = User.objects.all()
     serializer_class = UserAdminSerializer
+    pagination_class = EstimatedCountPagination
+    cursor_pagination_class = AdminCursorPagination
+    list_only_serializer_fields = True
     filterset_fields = ['is_active', 'is_staff', 'is_superuser', 'is_verified']
     search_fields = ['username', 'email', 'first_name', 'last_name', 'phone']
     ordering_fields = ['date_joined', 'last_login', 'username', 'email']
@@ -73,37 +218,58 @@ class UserAdminViewSet(BaseAdminViewSet):
             return UserDetailAdminSerializer
         return UserAdminSerializer
     
-    def get_queryset(self):
-        """Add annotations for better performance"""
-        return User.objects.select_related().prefetch_related(
-            'orders', 'favorites', 'cart'
+    def get_queryset_annotations(self, queryset):
+        """Order totals and full name computed in SQL"""
+        return super().get_queryset_annotations(queryset).annotate(
+            total_spent=sum_related(Order, 'user', 'total_price'),
+            full_name_db=User.full_name_expression(),
         )
     
-    @action(detail=False, methods=['get'])
+    def get_queryset(self):
+        """Prefetch only the recent rows shown on the detail page"""
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            # Only the five latest rows per user are fetched
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'orders',
+                    queryset=Order.objects.order_by('-created_at')[:5],
+                    to_attr='recent_orders_list',
+                ),
+                Prefetch(
+                    'favorites',
+                    queryset=Favorite.objects.select_related('product').order_by('-created_at')[:5],
+                    to_attr='recent_favorites_list',
+                ),
+            )
+        return queryset
+    
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def activity(self, request):
         """User activity statistics"""
         today = timezone.now().date()
         week_ago = today - timedelta(days=7)
         month_ago = today - timedelta(days=30)
         
-        active_today = User.objects.filter(last_login__date=today).count()
-        active_week = User.objects.filter(last_login__gte=week_ago).count()
-        active_month = User.objects.filter(last_login__gte=month_ago).count()
-        
-        return Response({
-            'active_today': active_today,
-            'active_week': active_week,
-            'active_month': active_month,
-            'total_users': User.objects.count(),
-            'verified_users': User.objects.filter(is_verified=True).count(),
-            'staff_users': User.objects.filter(is_staff=True).count(),
-        })
+        return Response(User.objects.aggregate(
+            active_today=Count('id', filter=Q(last_login__gte=today)),
+            active_week=Count('id', filter=Q(last_login__gte=week_ago)),
+            active_month=Count('id', filter=Q(last_login__gte=month_ago)),
+            total_users=Count('id'),
+            verified_users=Count('id', filter=Q(is_verified=True)),
+            staff_users=Count('id', filter=Q(is_staff=True)),
+        ))
 
 
 class ProductAdminViewSet(BaseAdminViewSet):
     """Admin CRUD for Products"""
-    queryset = Product.objects.all()
+    # Include soft deleted products
+    # images feed images_list, image_count and primary_image_url
+    queryset = Product.objects.select_related('category').prefetch_related('images')
     serializer_class = ProductAdminSerializer
+    pagination_class = EstimatedCountPagination
+    cursor_pagination_class = AdminCursorPagination
+    list_only_serializer_fields = True
     filterset_fields = ['is_active', 'is_featured', 'category', 'tags']
     search_fields = ['name_uz', 'name_ru', 'name_en', 'slug']
     ordering_fields = ['created_at', 'updated_at', 'price', 'stock']
@@ -115,27 +281,26 @@ class ProductAdminViewSet(BaseAdminViewSet):
             return ProductDetailAdminSerializer
         return ProductAdminSerializer
     
-    def get_queryset(self):
-        """Include soft deleted products and add optimizations"""
-        return Product.objects.select_related('category').prefetch_related(
-            'tags', 'images',
-        )
+    def get_queryset_annotations(self, queryset):
+        """Sales totals for the detail page, summed in SQL"""
+        queryset = super().get_queryset_annotations(queryset)
+        if self.action == 'retrieve':
+            queryset = queryset.annotate(
+                total_sold=sum_related(OrderItem, 'product', 'quantity', default=0),
+                revenue_generated=sum_related(OrderItem, 'product', 'total_price'),
+            )
+        return queryset
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def stats(self, request):
         """Product statistics"""
-        total = Product.objects.count()
-        active = Product.objects.filter(is_active=True, deleted_at__isnull=True).count()
-        featured = Product.objects.filter(is_featured=True, is_active=True).count()
-        out_of_stock = Product.objects.filter(stock=0, is_active=True).count()
-        
-        return Response({
-            'total_products': total,
-            'active_products': active,
-            'featured_products': featured,
-            'out_of_stock': out_of_stock,
-            'deleted_products': Product.objects.filter(deleted_at__isnull=False).count(),
-        })
+        return Response(Product.objects.aggregate(
+            total_products=Count('id'),
+            active_products=Count('id', filter=Q(is_active=True, deleted_at__isnull=True)),
+            featured_products=Count('id', filter=Q(is_featured=True, is_active=True)),
+            out_of_stock=Count('id', filter=Q(stock=0, is_active=True)),
+            deleted_products=Count('id', filter=Q(deleted_at__isnull=False)),
+        ))
     
     def create(self, request, *args, **kwargs):
         """Override create to support multipart with nested images"""
@@ -164,25 +329,36 @@ class ProductAdminViewSet(BaseAdminViewSet):
         alt_text_en = request.data.get('alt_text_en', '')
         is_primary = request.data.get('is_primary') in ['true', '1', True]
 
-        created = []
-        # Determine starting order
-        existing_count = product.images.count()
-        for index, f in enumerate(files):
-            img = ProductImage.objects.create(
+        # Append after the highest existing position
+        start = product.images.aggregate(last=Coalesce(Max('order'), -1))['last'] + 1
+        images = [
+            ProductImage(
                 product=product,
                 image=f,
                 alt_text_uz=alt_text_uz,
                 alt_text_ru=alt_text_ru,
                 alt_text_en=alt_text_en,
                 is_primary=is_primary and index == 0,  # only first one can be primary in batch
-                order=existing_count + index
+                order=start + index
             )
-            created.append({
-                'id': str(img.id),
-                'image_url': request.build_absolute_uri(img.image.url) if img.image else None,
-                'is_primary': img.is_primary,
-                'order': img.order
-            })
+            for index, f in enumerate(files)
+        ]
+        try:
+            with transaction.atomic():
+                # bulk_create skips ProductImage.save(), which unsets the old primary
+                if is_primary:
+                    product.images.filter(is_primary=True).update(is_primary=False)
+                images = ProductImage.objects.bulk_create(images)
+        except IntegrityError:
+            # A concurrent request set another primary image first
+            return Response({'detail': PRIMARY_IMAGE_CONFLICT}, status=409)
+
+        created = [{
+            'id': str(img.id),
+            'image_url': request.build_absolute_uri(img.image.url) if img.image else None,
+            'is_primary': img.is_primary,
+            'order': img.order
+        } for img in images]
         return Response({'created': created, 'count': len(created)}, status=201)
 
     @action(detail=True, methods=['patch'], url_path='set-primary-image')
@@ -191,13 +367,20 @@ class ProductAdminViewSet(BaseAdminViewSet):
         image_id = request.data.get('image_id')
         if not image_id:
             return Response({'detail': 'image_id talab qilinadi.'}, status=400)
+        # Two UPDATEs instead of a load plus ProductImage.save(); demote first so
+        # at most one primary exists at any point
         try:
-            img = product.images.get(id=image_id)
-        except ProductImage.DoesNotExist:
+            with transaction.atomic():
+                product.images.filter(is_primary=True).exclude(id=image_id).update(is_primary=False)
+                promoted = product.images.filter(id=image_id).update(
+                    is_primary=True, updated_at=timezone.now()
+                )
+                if not promoted:
+                    transaction.set_rollback(True)
+        except IntegrityError:
+            return Response({'detail': PRIMARY_IMAGE_CONFLICT}, status=409)
+        if not promoted:
             return Response({'detail': 'Rasm topilmadi.'}, status=404)
-        # Set as primary (save triggers unsetting others)
-        img.is_primary = True
-        img.save()
         return Response({'detail': 'Asosiy rasm yangilandi.'})
 
     @action(detail=True, methods=['delete'], url_path='delete-image')
@@ -232,8 +415,11 @@ class ProductTagAdminViewSet(BaseAdminViewSet):
 
 class OrderAdminViewSet(BaseAdminViewSet):
     """Admin CRUD for Orders"""
-    queryset = Order.objects.all()
+    queryset = Order.objects.select_related('user')
     serializer_class = OrderAdminSerializer
+    pagination_class = EstimatedCountPagination
+    cursor_pagination_class = AdminCursorPagination
+    list_only_serializer_fields = True
     filterset_fields = ['status', 'created_at', 'user']
     search_fields = ['id', 'full_name', 'contact_phone']
     ordering_fields = ['created_at', 'updated_at', 'total_price']
@@ -246,44 +432,72 @@ class OrderAdminViewSet(BaseAdminViewSet):
         return OrderAdminSerializer
     
     def get_queryset(self):
-        """Add optimizations for orders"""
-        return Order.objects.select_related('user').prefetch_related(
-            'items__product'
-        )
+        """Items are only rendered on the detail page"""
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'items',
+                    # The FK columns must stay loaded to attach items and products
+                    queryset=OrderItem.objects.select_related('product').only(
+                        'id', 'order', 'product', 'quantity', 'unit_price', 'total_price',
+                        'product__id', 'product__name_uz',
+                    ),
+                )
+            )
+        return queryset
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def revenue(self, request):
-        """Revenue statistics"""
+        """
+        Revenue statistics.
+        Totals and order counts are always aggregated live. A week or month
+        bucket is read from OrderDailyRollup only when the rollup has every
+        day of it up to yesterday; otherwise it is aggregated live too. Order
+        signals refresh a rolled-up day when its orders change, so both
+        sources agree. Today is always live.
+        """
         today = timezone.now().date()
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        today_revenue = Order.objects.filter(
-            created_at__date=today,
-            status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0
-        
-        week_revenue = Order.objects.filter(
-            created_at__gte=week_ago,
-            status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0
+        yesterday = today - timedelta(days=1)
+        windows = {
+            'week_revenue': today - timedelta(days=7),
+            'month_revenue': today - timedelta(days=30),
+        }
         
-        month_revenue = Order.objects.filter(
-            created_at__gte=month_ago,
-            status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0
+        completed = Q(status='completed')
+        zero = Value(Decimal('0.00'))
         
-        total_revenue = Order.objects.filter(
-            status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0
+        rolled = OrderDailyRollup.objects.filter(
+            date__gte=windows['month_revenue'], date__lte=yesterday
+        ).aggregate(
+            week_revenue_days=Count('date', distinct=True, filter=Q(date__gte=windows['week_revenue'])),
+            month_revenue_days=Count('date', distinct=True),
+            week_revenue=Coalesce(Sum('revenue', filter=completed & Q(date__gte=windows['week_revenue'])), zero),
+            month_revenue=Coalesce(Sum('revenue', filter=completed), zero),
+        )
+        covered = {
+            key for key, start in windows.items()
+            if rolled[f'{key}_days'] == (yesterday - start).days + 1
+        }
         
+        live = Order.objects.aggregate(
+            today_revenue=Coalesce(Sum('total_price', filter=completed & Q(created_at__gte=today)), zero),
+            total_revenue=Coalesce(Sum('total_price', filter=completed), zero),
+            pending_orders=Count('id', filter=Q(status='pending')),
+            completed_orders=Count('id', filter=completed),
+            **{
+                key: Coalesce(Sum('total_price', filter=completed & Q(created_at__gte=start)), zero)
+                for key, start in windows.items()
+                if key not in covered
+            },
+        )
+        for key in covered:
+            live[key] = rolled[key] + live['today_revenue']
         return Response({
-            'today_revenue': today_revenue,
-            'week_revenue': week_revenue,
-            'month_revenue': month_revenue,
-            'total_revenue': total_revenue,
-            'pending_orders': Order.objects.filter(status='pending').count(),
-            'completed_orders': Order.objects.filter(status='completed').count(),
+            key: live[key] for key in (
+                'today_revenue', 'week_revenue', 'month_revenue',
+                'total_revenue', 'pending_orders', 'completed_orders',
+            )
         })
 
 
@@ -296,18 +510,14 @@ class CourseApplicationAdminViewSet(BaseAdminViewSet):
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
     
-    def get_queryset(self):
-        """Add optimizations"""
-        return CourseApplication.objects.select_related()
-    
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def stats(self, request):
         """Application statistics"""
-        return Response({
-            'total_applications': CourseApplication.objects.count(),
-            'pending_applications': CourseApplication.objects.filter(processed=False).count(),
-            'processed_applications': CourseApplication.objects.filter(processed=True).count(),
-        })
+        return Response(CourseApplication.objects.aggregate(
+            total_applications=Count('id'),
+            pending_applications=Count('id', filter=Q(processed=False)),
+            processed_applications=Count('id', filter=Q(processed=True)),
+        ))
 
 
 class FranchiseApplicationAdminViewSet(BaseAdminViewSet):
@@ -319,63 +529,65 @@ class FranchiseApplicationAdminViewSet(BaseAdminViewSet):
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
     
-    def get_queryset(self):
-        """Add optimizations"""
-        return FranchiseApplication.objects.select_related()
-    
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def stats(self, request):
         """Franchise application statistics"""
-        return Response({
-            'total_applications': FranchiseApplication.objects.count(),
-            'pending_applications': FranchiseApplication.objects.filter(status='pending').count(),
-            'approved_applications': FranchiseApplication.objects.filter(status='approved').count(),
-            'rejected_applications': FranchiseApplication.objects.filter(status='rejected').count(),
-        })
-    
-    @action(detail=False, methods=['get'])
+        return Response(FranchiseApplication.objects.aggregate(
+            total_applications=Count('id'),
+            pending_applications=Count('id', filter=Q(status='pending')),
+            approved_applications=Count('id', filter=Q(status='approved')),
+            rejected_applications=Count('id', filter=Q(status='rejected')),
+        ))
+    
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def roi_stats(self, request):
         """ROI and investment statistics"""
-        total_investment = FranchiseApplication.objects.filter(
-            status='approved'
-        ).aggregate(total=Sum('investment_amount'))['total'] or Decimal('0')
-        
-        avg_investment = FranchiseApplication.objects.filter(
-            status='approved'
-        ).aggregate(avg=Sum('investment_amount'))['avg'] or Decimal('0')
-        
-        return Response({
-            'total_approved_investment': total_investment,
-            'average_investment': avg_investment,
-            'total_applications': FranchiseApplication.objects.count(),
-            'pending_applications': FranchiseApplication.objects.filter(status='pending').count(),
-            'approved_applications': FranchiseApplication.objects.filter(status='approved').count(),
-            'rejected_applications': FranchiseApplication.objects.filter(status='rejected').count(),
-        })
+        approved = Q(status='approved')
+        zero = Value(Decimal('0.00'))
+        return Response(FranchiseApplication.objects.aggregate(
+            total_approved_investment=Coalesce(Sum('investment_amount', filter=approved), zero),
+            average_investment=Coalesce(Avg('investment_amount', filter=approved), zero),
+            total_applications=Count('id'),
+            pending_applications=Count('id', filter=Q(status='pending')),
+            approved_applications=Count('id', filter=approved),
+            rejected_applications=Count('id', filter=Q(status='rejected')),
+        ))
 
 
 class CartAdminViewSet(BaseAdminViewSet):
     """Admin CRUD for Cart"""
-    queryset = Cart.objects.all()
+    queryset = Cart.objects.select_related('user')
     serializer_class = CartAdminSerializer
+    pagination_class = EstimatedCountPagination
     filterset_fields = ['user', 'created_at']
     search_fields = ['user__username', 'user__email', 'session_key']
     ordering_fields = ['created_at', 'updated_at']
     ordering = ['-updated_at']
     
-    def get_queryset(self):
-        """Add optimizations"""
-        return Cart.objects.select_related('user').prefetch_related('items__product')
+    def get_queryset_annotations(self, queryset):
+        """Compute cart value in SQL"""
+        # Same rule as Product.final_price: sale price only when lower than price
+        unit_price = Case(
+            When(product__sale_price__lt=F('product__price'), then=F('product__sale_price')),
+            default=F('product__price'),
+        )
+        line_total = ExpressionWrapper(
+            F('quantity') * unit_price,
+            output_field=DecimalField(max_digits=15, decimal_places=2),
+        )
+        return super().get_queryset_annotations(queryset).annotate(
+            total_value=sum_related(CartItem, 'cart', line_total),
+        )
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def stats(self, request):
         """Cart statistics"""
-        return Response({
-            'total_carts': Cart.objects.count(),
-            'active_carts': Cart.objects.filter(items__isnull=False).distinct().count(),
-            'anonymous_carts': Cart.objects.filter(user__isnull=True).count(),
-            'user_carts': Cart.objects.filter(user__isnull=False).count(),
-        })
+        return Response(Cart.objects.aggregate(
+            total_carts=Count('id'),
+            active_carts=Count('id', filter=Exists(CartItem.objects.filter(cart=OuterRef('pk')))),
+            anonymous_carts=Count('id', filter=Q(user__isnull=True)),
+            user_carts=Count('id', filter=Q(user__isnull=False)),
+        ))
 
 
 class FavoriteAdminViewSet(BaseAdminViewSet):
@@ -391,193 +603,256 @@ class FavoriteAdminViewSet(BaseAdminViewSet):
         """Add optimizations"""
         return Favorite.objects.select_related('user', 'product')
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], renderer_classes=STATS_RENDERER_CLASSES)
     def stats(self, request):
         """Favorites statistics"""
-        return Response({
-            'total_favorites': Favorite.objects.count(),
-            'unique_users': Favorite.objects.values('user').distinct().count(),
-            'unique_products': Favorite.objects.values('product').distinct().count(),
-        })
+        return Response(Favorite.objects.aggregate(
+            total_favorites=Count('id'),
+            unique_users=Count('user', distinct=True),
+            unique_products=Count('product', distinct=True),
+        ))
 
 
 # Dashboard and Stats Views
-@api_view(['GET'])
-@permission_classes([IsAdminUser])
-def dashboard_stats(request):
-    """
-    Complete dashboard statistics for admin panel
-    GET /api/admin/dashboard/
-    """
-    today = timezone.now().date()
+def _dashboard_stats_payload(today):
+    """Build the dashboard_stats response body"""
+    month_start = today.replace(day=1)
     
     # User stats
-    user_stats = {
-        'total': User.objects.count(),
-        'active': User.objects.filter(is_active=True).count(),
-        'admins': User.objects.filter(is_staff=True).count(),
-        'verified': User.objects.filter(is_verified=True).count(),
-        'new_today': User.objects.filter(date_joined__date=today).count(),
-    }
+    user_stats = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        admins=Count('id', filter=Q(is_staff=True)),
+        verified=Count('id', filter=Q(is_verified=True)),
+        new_today=Count('id', filter=Q(date_joined__gte=today)),
+    )
     
     # Product stats
-    product_stats = {
-        'total': Product.objects.count(),
-        'active': Product.objects.filter(is_active=True, deleted_at__isnull=True).count(),
-        'featured': Product.objects.filter(is_featured=True).count(),
-        'out_of_stock': Product.objects.filter(stock=0).count(),
-    }
-    
-    # Order stats
-    order_stats = {
-        'total': Order.objects.count(),
-        'pending': Order.objects.filter(status='pending').count(),
-        'completed': Order.objects.filter(status='delivered').count(),
-        'cancelled': Order.objects.filter(status='canceled').count(),
-        'today': Order.objects.filter(created_at__date=today).count(),
+    product_stats = Product.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True, deleted_at__isnull=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+        out_of_stock=Count('id', filter=Q(stock=0)),
+    )
+    
+    # Order and revenue stats
+    order_stats = Order.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        completed=Count('id', filter=Q(status='delivered')),
+        cancelled=Count('id', filter=Q(status='canceled')),
+        today=Count('id', filter=Q(created_at__gte=today)),
+        revenue_today=Sum('total_price', filter=Q(created_at__gte=today)),
+        revenue_this_month=Sum('total_price', filter=Q(created_at__gte=month_start)),
+    )
+    revenue_stats = {
+        'today': order_stats.pop('revenue_today') or Decimal('0'),
+        'this_month': order_stats.pop('revenue_this_month') or Decimal('0'),
     }
     
     # Course application stats
-    course_stats = {
-        'total_applications': CourseApplication.objects.count(),
-        'pending': CourseApplication.objects.filter(processed=False).count(),
-        'processed': CourseApplication.objects.filter(processed=True).count(),
-        'today': CourseApplication.objects.filter(created_at__date=today).count(),
-    }
+    course_stats = CourseApplication.objects.aggregate(
+        total_applications=Count('id'),
+        pending=Count('id', filter=Q(processed=False)),
+        processed=Count('id', filter=Q(processed=True)),
+        today=Count('id', filter=Q(created_at__gte=today)),
+    )
     
     # Franchise application stats
-    franchise_stats = {
-        'total_applications': FranchiseApplication.objects.count(),
-        'pending': FranchiseApplication.objects.filter(status='pending').count(),
-        'approved': FranchiseApplication.objects.filter(status='approved').count(),
-        'rejected': FranchiseApplication.objects.filter(status='rejected').count(),
-    }
-    
-    # Revenue stats
-    revenue_stats = {
-        'today': Order.objects.filter(
-            created_at__date=today
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0'),
-        'this_month': Order.objects.filter(
-            created_at__month=today.month, 
-            created_at__year=today.year
-        ).aggregate(total=Sum('total_amount'))['total'] or Decimal('0'),
-    }
-    
-    return Response({
+    franchise_stats = FranchiseApplication.objects.aggregate(
+        total_applications=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        approved=Count('id', filter=Q(status='approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+    )
+    
+    return {
         'users': user_stats,
         'products': product_stats,
         'orders': order_stats,
         'courses': course_stats,
         'franchises': franchise_stats,
         'revenue': revenue_stats,
-    })
+    }
 
 
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
-def applications_stats(request):
+@renderer_classes(STATS_RENDERER_CLASSES)
+def dashboard_stats(request):
     """
-    Combined applications statistics (course + franchise)
-    GET /api/admin/applications/stats/
+    Complete dashboard statistics for admin panel
+    GET /api/admin/dashboard/
     """
-    # Course applications
-    course_apps = {
-        'total': CourseApplication.objects.count(),
-        'pending': CourseApplication.objects.filter(processed=False).count(),
-        'processed': CourseApplication.objects.filter(processed=True).count(),
-        'today': CourseApplication.objects.filter(
-            created_at__date=timezone.now().date()
-        ).count(),
-        'popular_courses': list(
+    today = timezone.now().date()
+    payload = cache.get_or_set(
+        f'admin:dashboard_stats:{today.isoformat()}',
+        lambda: _dashboard_stats_payload(today),
+        DASHBOARD_CACHE_TIMEOUT,
+    )
+    return Response(payload)
+
+
+def _course_applications_stats(today):
+    """Course part of applications_stats"""
+    course_apps = CourseApplication.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(processed=False)),
+        processed=Count('id', filter=Q(processed=True)),
+        today=Count('id', filter=Q(created_at__gte=today)),
+    )
+    course_apps['popular_courses'] = cache.get_or_set(
+        'admin:popular_courses',
+        lambda: list(
             CourseApplication.objects.values('course_name')
             .annotate(count=Count('id'))
             .order_by('-count')[:5]
-        )
-    }
-    
-    # Franchise applications
-    franchise_apps = {
-        'total': FranchiseApplication.objects.count(),
-        'pending': FranchiseApplication.objects.filter(status='pending').count(),
-        'approved': FranchiseApplication.objects.filter(status='approved').count(),
-        'rejected': FranchiseApplication.objects.filter(status='rejected').count(),
-        'total_investment': FranchiseApplication.objects.filter(
-            status='approved'
-        ).aggregate(total=Sum('investment_amount'))['total'] or Decimal('0'),
-        'popular_cities': list(
+        ),
+        POPULAR_CACHE_TIMEOUT,
+    )
+    return course_apps
+
+
+def _franchise_applications_stats():
+    """Franchise part of applications_stats"""
+    franchise_apps = FranchiseApplication.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        approved=Count('id', filter=Q(status='approved')),
+        rejected=Count('id', filter=Q(status='rejected')),
+        total_investment=Sum('investment_amount', filter=Q(status='approved')),
+    )
+    franchise_apps['total_investment'] = franchise_apps['total_investment'] or Decimal('0')
+    franchise_apps['popular_cities'] = cache.get_or_set(
+        'admin:popular_cities',
+        lambda: list(
             FranchiseApplication.objects.values('city')
             .annotate(count=Count('id'))
             .order_by('-count')[:5]
-        )
-    }
-    
-    return Response({
-        'course_applications': course_apps,
-        'franchise_applications': franchise_apps,
-    })
+        ),
+        POPULAR_CACHE_TIMEOUT,
+    )
+    return franchise_apps
 
 
-# Dashboard Statistics Views
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
-def admin_dashboard_stats(request):
-    """Admin dashboard statistics"""
+@renderer_classes(STATS_RENDERER_CLASSES)
+def applications_stats(request):
+    """
+    Combined applications statistics (course + franchise)
+    GET /api/admin/applications/stats/
+    """
     today = timezone.now().date()
+    # Cached separately so either half can expire or be dropped on its own
+    return Response({
+        'course_applications': cache.get_or_set(
+            f'admin:applications:course:{today.isoformat()}',
+            lambda: _course_applications_stats(today),
+            DASHBOARD_CACHE_TIMEOUT,
+        ),
+        'franchise_applications': cache.get_or_set(
+            f'admin:applications:franchise:{today.isoformat()}',
+            _franchise_applications_stats,
+            DASHBOARD_CACHE_TIMEOUT,
+        ),
+    })
+
+
+# Dashboard Statistics Views
+def _admin_dashboard_payload(today):
+    """Build the admin_dashboard_stats response body"""
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
     # User stats
-    user_stats = {
-        'total_users': User.objects.count(),
-        'active_users': User.objects.filter(is_active=True).count(),
-        'new_users_today': User.objects.filter(date_joined__date=today).count(),
-        'new_users_week': User.objects.filter(date_joined__gte=week_ago).count(),
-    }
+    user_stats = User.objects.aggregate(
+        total_users=Count('id'),
+        active_users=Count('id', filter=Q(is_active=True)),
+        new_users_today=Count('id', filter=Q(date_joined__gte=today)),
+        new_users_week=Count('id', filter=Q(date_joined__gte=week_ago)),
+    )
     
     # Product stats
-    product_stats = {
-        'total_products': Product.objects.count(),
-        'active_products': Product.objects.filter(is_active=True, deleted_at__isnull=True).count(),
-        'featured_products': Product.objects.filter(is_featured=True, is_active=True).count(),
-        'out_of_stock': Product.objects.filter(stock=0, is_active=True).count(),
-    }
-    
-    # Order stats
-    order_stats = {
-        'total_orders': Order.objects.count(),
-        'pending_orders': Order.objects.filter(status='pending').count(),
-        'completed_orders': Order.objects.filter(status='completed').count(),
-        'today_orders': Order.objects.filter(created_at__date=today).count(),
-        'week_orders': Order.objects.filter(created_at__gte=week_ago).count(),
-    }
-    
-    # Revenue stats
+    product_stats = Product.objects.aggregate(
+        total_products=Count('id'),
+        active_products=Count('id', filter=Q(is_active=True, deleted_at__isnull=True)),
+        featured_products=Count('id', filter=Q(is_featured=True, is_active=True)),
+        out_of_stock=Count('id', filter=Q(stock=0, is_active=True)),
+    )
+    
+    # Order and revenue stats
+    order_stats = Order.objects.aggregate(
+        total_orders=Count('id'),
+        pending_orders=Count('id', filter=Q(status='pending')),
+        completed_orders=Count('id', filter=Q(status='completed')),
+        today_orders=Count('id', filter=Q(created_at__gte=today)),
+        week_orders=Count('id', filter=Q(created_at__gte=week_ago)),
+        today_revenue=Sum('total_price', filter=Q(created_at__gte=today, status='completed')),
+        week_revenue=Sum('total_price', filter=Q(created_at__gte=week_ago, status='completed')),
+        month_revenue=Sum('total_price', filter=Q(created_at__gte=month_ago, status='completed')),
+    )
     revenue_stats = {
-        'today_revenue': Order.objects.filter(
-            created_at__date=today, status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0,
-        'week_revenue': Order.objects.filter(
-            created_at__gte=week_ago, status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0,
-        'month_revenue': Order.objects.filter(
-            created_at__gte=month_ago, status='completed'
-        ).aggregate(total=Sum('total_price'))['total'] or 0,
+        key: order_stats.pop(key) or 0
+        for key in ('today_revenue', 'week_revenue', 'month_revenue')
     }
     
     # Application stats
     application_stats = {
-        'course_applications': CourseApplication.objects.count(),
-        'pending_course_applications': CourseApplication.objects.filter(processed=False).count(),
-        'franchise_applications': FranchiseApplication.objects.count(),
-        'pending_franchise_applications': FranchiseApplication.objects.filter(status='pending').count(),
+        **CourseApplication.objects.aggregate(
+            course_applications=Count('id'),
+            pending_course_applications=Count('id', filter=Q(processed=False)),
+        ),
+        **FranchiseApplication.objects.aggregate(
+            franchise_applications=Count('id'),
+            pending_franchise_applications=Count('id', filter=Q(status='pending')),
+        ),
     }
     
-    return Response({
+    return {
         'user_stats': user_stats,
         'product_stats': product_stats,
         'order_stats': order_stats,
         'revenue_stats': revenue_stats,
         'application_stats': application_stats,
         'generated_at': timezone.now().isoformat(),
-    })
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes(STATS_RENDERER_CLASSES)
+def admin_dashboard_stats(request):
+    """Admin dashboard statistics"""
+    today = timezone.now().date()
+    payload = cache.get_or_set(
+        f'admin:dashboard:{today.isoformat()}',
+        lambda: _admin_dashboard_payload(today),
+        DASHBOARD_CACHE_TIMEOUT,
+    )
+    return Response(payload)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes(STATS_RENDERER_CLASSES)
+def admin_summary(request):
+    """Headline counts, one conditional aggregate query per table"""
+    summary = {}
+    summary.update(User.objects.aggregate(
+        total_users=Count('id'),
+        verified_users=Count('id', filter=Q(is_verified=True)),
+        staff_users=Count('id', filter=Q(is_staff=True)),
+    ))
+    summary.update(Order.objects.aggregate(
+        total_orders=Count('id'),
+        pending_orders=Count('id', filter=Q(status='pending')),
+        delivered_orders=Count('id', filter=Q(status='delivered')),
+    ))
+    summary.update(Product.objects.aggregate(
+        total_products=Count('id'),
+        active_products=Count('id', filter=Q(is_active=True, deleted_at__isnull=True)),
+        featured_products=Count('id', filter=Q(is_featured=True, is_active=True)),
+        out_of_stock=Count('id', filter=Q(stock=0, is_active=True)),
+    ))
+    return Response(AdminSummarySerializer(summary).data)
@@ -1,13 +1,20 @@
-from django.contrib.sessions.models import Session
-from django.contrib.sessions.backends.db import SessionStore
+from importlib import import_module
+
+from django.conf import settings
+
+# Same backend SessionMiddleware uses
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
 
 class CustomSessionMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        session_key = request.headers.get("X-Session-Key")
-        if session_key:
+        session_key = request.META.get("HTTP_X_SESSION_KEY")
+        session = getattr(request, "session", None)
+        # Keep the session SessionMiddleware attached when it is already this one.
+        # A new SessionStore stays lazy until the view touches it.
+        if session_key and (session is None or session.session_key != session_key):
             request.session = SessionStore(session_key=session_key)
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
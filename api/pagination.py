@@ -0,0 +1,146 @@
+"""
+Pagination classes for the API
+"""
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from api.utils import generate_cache_key
+
+
+class AnnotatedPaginator(Paginator):
+    """
+    Paginator that counts `object_list` as given and applies `annotate` only
+    to the page being sliced, so `COUNT(*)` never carries the annotations.
+    """
+
+    def __init__(self, *args, annotate=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.annotate = annotate
+
+    def page(self, number):
+        """Return a Page of the annotated queryset for the given 1-based number"""
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        object_list = self.object_list
+        if self.annotate is not None:
+            object_list = self.annotate(object_list)
+        return self._get_page(object_list[bottom:top], number, self)
+
+
+class EstimatedCountPaginator(AnnotatedPaginator):
+    """
+    Paginator that avoids a full `COUNT(*)` where it can.
+
+    Unfiltered querysets on large PostgreSQL tables use the planner's row
+    estimate from pg_class. Everything else is counted once and cached
+    under `cache_key`; `refresh` forces a recount (done on the first page).
+    """
+    # Below this many estimated rows an exact count is cheap enough
+    estimate_threshold = 100000
+    cache_timeout = 60 * 5
+
+    def __init__(self, *args, cache_key=None, refresh=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_key = cache_key
+        self.refresh = refresh
+
+    @cached_property
+    def count(self):
+        estimate = self.get_estimate()
+        if estimate is not None and estimate > self.estimate_threshold:
+            return estimate
+
+        if self.cache_key is None:
+            return super().count
+
+        count = None if self.refresh else cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.cache_timeout)
+        return count
+
+    def get_estimate(self):
+        """Planner row estimate for an unfiltered queryset, else None"""
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where or query.distinct:
+            return None
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [query.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for tables that have never been analyzed
+        if row is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+
+class AdminPagination(PageNumberPagination):
+    """
+    Page number pagination for admin viewsets. The view's
+    `get_queryset_annotations()` is applied to the page slice only.
+    """
+    paginator_class = AnnotatedPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._paginated_request = request
+        self._paginated_view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        return self.paginator_class(object_list, per_page, **self.get_paginator_kwargs())
+
+    def get_paginator_kwargs(self):
+        return {
+            'annotate': getattr(self._paginated_view, 'get_queryset_annotations', None),
+        }
+
+
+class EstimatedCountPagination(AdminPagination):
+    """
+    Admin pagination for large lists.
+    The total `count` may be an estimate or up to five minutes stale.
+    """
+    paginator_class = EstimatedCountPaginator
+
+    def get_paginator_kwargs(self):
+        request = self._paginated_request
+        return {
+            **super().get_paginator_kwargs(),
+            'cache_key': self.get_count_cache_key(request),
+            'refresh': request.query_params.get(self.page_query_param, '1') == '1',
+        }
+
+    def get_count_cache_key(self, request):
+        """Cache key for the total count; ignores the page parameters"""
+        params = dict(request.query_params.lists())
+        params.pop(self.page_query_param, None)
+        if self.page_size_query_param:
+            params.pop(self.page_size_query_param, None)
+        return generate_cache_key(f'paginator_count_{request.path}', params)
+
+
+class AdminCursorPagination(CursorPagination):
+    """
+    Keyset pagination for deep admin lists, selected with `?cursor=`.
+    Pages cost the same at any depth but carry no total `count`.
+    Ordering comes from the view's OrderingFilter, else `ordering`.
+    """
+    ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # No COUNT runs here, so the page query carries the annotations
+        annotate = getattr(view, 'get_queryset_annotations', None)
+        if annotate is not None:
+            queryset = annotate(queryset)
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,34 @@
+"""
+Custom parser classes for the API
+"""
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import MultiPartParser
+
+from api.serializers import AVATAR_MAX_SIZE
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Rasm hajmi 5MB dan oshmasligi kerak."
+    default_code = 'upload_too_large'
+
+
+class AvatarMultiPartParser(MultiPartParser):
+    """
+    Multipart parser that refuses oversized bodies from Content-Length,
+    before the upload is streamed to memory or a temp file.
+    """
+    # Room for the multipart boundaries and headers around the file
+    multipart_overhead = 64 * 1024
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = (parser_context or {}).get('request')
+        if request is not None:
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except (TypeError, ValueError):
+                content_length = 0
+            if content_length > AVATAR_MAX_SIZE + self.multipart_overhead:
+                raise UploadTooLarge()
+        return super().parse(stream, media_type, parser_context)
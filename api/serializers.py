@@ -6,15 +6,73 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
-from django.contrib.auth.password_validation import validate_password
-from django.core.exceptions import ValidationError
 from apps.products.models import Product, ProductCategory, ProductTag, ProductImage
-from django.db.models import Avg, Count
+from django.db.models import Avg, Count, Prefetch, Q
+from django.utils.functional import cached_property
 import re
 
+from api.fields import BulkPrimaryKeyRelatedField
+from api.utils import count_related
+
 
 User = get_user_model()
 
+# Compiled once; \Z rather than $ so a trailing newline never matches
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+\Z')
+
+# Avatar upload limits, also enforced on Content-Length by AvatarMultiPartParser
+AVATAR_MAX_SIZE = 5 * 1024 * 1024
+AVATAR_CONTENT_TYPES = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/webp'})
+
+# Field suffix per supported `lang`; anything else falls back to Uzbek
+LANGUAGE_SUFFIXES = {'uz': '_uz', 'ru': '_ru', 'en': '_en'}
+
+
+def localized(obj, field, language):
+    """Read `obj.<field>_<language>`, e.g. localized(product, 'name', 'ru')"""
+    return getattr(obj, field + LANGUAGE_SUFFIXES.get(language, '_uz'))
+
+
+class LocalizedSerializerMixin:
+    """Requested `language` for serializers with localized fields"""
+    
+    @cached_property
+    def language(self):
+        # Read from the root's context once, not once per field per row
+        return self.context.get('language', 'uz')
+
+
+def validate_user_available(username, email=None):
+    """
+    Raise a ValidationError naming whichever of `username` and `email`
+    is already registered. Both are checked with a single query.
+    """
+    lookup = Q(username=username)
+    if email:
+        lookup |= Q(email=email)
+    errors = {}
+    for taken_username, taken_email in User.objects.filter(lookup).values_list('username', 'email'):
+        if taken_username == username:
+            errors['username'] = "Bu foydalanuvchi nomi allaqachon band."
+        if email and taken_email == email:
+            errors['email'] = "Bu email allaqon ro'yxatdan o'tgan."
+    if errors:
+        raise serializers.ValidationError(errors)
+
+
+def resolve_login_username(login):
+    """
+    Username to authenticate for a login value that may be an email.
+    An exact username match wins, so a username containing "@" never
+    logs in as the account that has it as email.
+    """
+    if '@' not in login or User.objects.filter(username=login).exists():
+        return login
+    email_username = User.objects.filter(email=login).values_list(
+        'username', flat=True
+    ).first()
+    return login if email_username is None else email_username
+
 
 # Authentication Serializers
 
@@ -31,6 +89,8 @@ class SimpleUserRegistrationSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'password']
         read_only_fields = ['id']
+        # Uniqueness is checked once in validate() instead of by a UniqueValidator
+        extra_kwargs = {'username': {'validators': [User.username_validator]}}
         
     def validate_username(self, value):
         """Validate username"""
@@ -38,12 +98,6 @@ class SimpleUserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Foydalanuvchi nomi kamida 3 ta belgidan iborat bo'lishi kerak."
             )
-            
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError(
-                "Bu foydalanuvchi nomi allaqachon band."
-            )
-            
         return value
         
     def validate_password(self, value):
@@ -54,6 +108,11 @@ class SimpleUserRegistrationSerializer(serializers.ModelSerializer):
             )
         return value
         
+    def validate(self, attrs):
+        """Reject a username that is already taken"""
+        validate_user_available(attrs['username'])
+        return attrs
+        
     def create(self, validated_data):
         """Create new user"""
         user = User.objects.create_user(
@@ -64,87 +123,6 @@ class SimpleUserRegistrationSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
-    """Serializer for user registration - simplified version"""
-    
-    password = serializers.CharField(
-        write_only=True,
-        min_length=6,
-        help_text="Password must be at least 6 characters long"
-    )
-    password_confirm = serializers.CharField(
-        write_only=True,
-        help_text="Confirm your password"
-    )
-    email = serializers.EmailField(required=True)
-    first_name = serializers.CharField(required=False, max_length=30, allow_blank=True)
-    last_name = serializers.CharField(required=False, max_length=30, allow_blank=True)
-    
-    class Meta:
-        model = User
-        fields = [
-            'id', 'username', 'email', 'first_name', 'last_name',
-            'password', 'password_confirm'
-        ]
-        read_only_fields = ['id']
-        
-    def validate_username(self, value):
-        """Validate username"""
-        if len(value) < 3:
-            raise serializers.ValidationError(
-                "Foydalanuvchi nomi kamida 3 ta belgidan iborat bo'lishi kerak."
-            )
-        
-        if not re.match(r'^[a-zA-Z0-9_]+$', value):
-            raise serializers.ValidationError(
-                "Foydalanuvchi nomida faqat harflar, raqamlar va pastki chiziq bo'lishi mumkin."
-            )
-            
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError(
-                "Bu foydalanuvchi nomi allaqachon band."
-            )
-            
-        return value
-        
-    def validate_email(self, value):
-        """Validate email"""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                "Bu email allaqon ro'yxatdan o'tgan."
-            )
-        return value
-        
-    def validate_password(self, value):
-        """Validate password - simplified"""
-        if len(value) < 6:
-            raise serializers.ValidationError(
-                "Parol kamida 6 ta belgidan iborat bo'lishi kerak."
-            )
-        return value
-        
-    def validate(self, attrs):
-        """Validate password confirmation"""
-        if attrs['password'] != attrs['password_confirm']:
-            raise serializers.ValidationError({
-                'password_confirm': 'Parollar mos kelmaydi.'
-            })
-        return attrs
-        
-    def create(self, validated_data):
-        """Create new user"""
-        validated_data.pop('password_confirm')
-        
-        # Set default values for optional fields
-        if not validated_data.get('first_name'):
-            validated_data['first_name'] = ''
-        if not validated_data.get('last_name'):
-            validated_data['last_name'] = ''
-            
-        user = User.objects.create_user(**validated_data)
-        return user
-
-
 class UserLoginSerializer(serializers.Serializer):
     """Serializer for user login"""
     
@@ -164,17 +142,11 @@ class UserLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
         
         if username and password:
-            # Try to authenticate with username first
+            # Resolve an email to its username first, so the password is
+            # hashed only once
+            username = resolve_login_username(username)
             user = authenticate(username=username, password=password)
             
-            # If that fails, try with email
-            if not user:
-                try:
-                    user_obj = User.objects.get(email=username)
-                    user = authenticate(username=user_obj.username, password=password)
-                except User.DoesNotExist:
-                    pass
-            
             if not user:
                 raise serializers.ValidationError(
                     'Foydalanuvchi nomi yoki parol noto\'g\'ri.'
@@ -209,19 +181,15 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'full_name', 'display_name', 'phone', 'avatar', 'avatar_url',
             'is_verified', 'is_active', 'is_staff', 'date_joined', 'last_login'
         ]
-        read_only_fields = [
-            'id', 'username', 'is_active', 'is_staff', 'date_joined', 'last_login',
-            'full_name', 'display_name', 'avatar_url'
-        ]
+        read_only_fields = ['id', 'username', 'is_active', 'is_staff']
         
     def get_avatar_url(self, obj):
         """Get full URL for avatar image"""
-        if obj.avatar and hasattr(obj.avatar, 'url'):
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.avatar.url)
-            return obj.avatar.url
-        return None
+        if not obj.avatar:
+            return None
+        url = obj.avatar.url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
         
     def validate_email(self, value):
         """Validate email during update"""
@@ -269,6 +237,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             'phone', 'password', 'password_confirm'
         ]
         read_only_fields = ['id']
+        # Uniqueness is checked with the email in validate() instead of by a UniqueValidator
+        extra_kwargs = {'username': {'validators': [User.username_validator]}}
         
     def validate_username(self, value):
         """Validate username"""
@@ -277,24 +247,11 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
                 "Foydalanuvchi nomi kamida 3 ta belgidan iborat bo'lishi kerak."
             )
         
-        if not re.match(r'^[a-zA-Z0-9_]+$', value):
+        if not USERNAME_RE.match(value):
             raise serializers.ValidationError(
                 "Foydalanuvchi nomida faqat harflar, raqamlar va pastki chiziq bo'lishi mumkin."
             )
             
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError(
-                "Bu foydalanuvchi nomi allaqachon band."
-            )
-            
-        return value
-        
-    def validate_email(self, value):
-        """Validate email"""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError(
-                "Bu email allaqon ro'yxatdan o'tgan."
-            )
         return value
         
     def validate_phone(self, value):
@@ -318,11 +275,12 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return value
         
     def validate(self, attrs):
-        """Validate password confirmation"""
+        """Validate password confirmation and username/email availability"""
         if attrs['password'] != attrs['password_confirm']:
             raise serializers.ValidationError({
                 'password_confirm': 'Parollar mos kelmaydi.'
             })
+        validate_user_available(attrs['username'], attrs['email'])
         return attrs
         
     def create(self, validated_data):
@@ -348,13 +306,6 @@ class ChangePasswordSerializer(serializers.Serializer):
     new_password = serializers.CharField(required=True, write_only=True, min_length=6)
     new_password_confirm = serializers.CharField(required=True, write_only=True)
     
-    def validate_old_password(self, value):
-        """Validate old password"""
-        user = self.context['request'].user
-        if not user.check_password(value):
-            raise serializers.ValidationError('Eski parol noto\'g\'ri.')
-        return value
-        
     def validate_new_password(self, value):
         """Validate new password"""
         if len(value) < 6:
@@ -364,11 +315,23 @@ class ChangePasswordSerializer(serializers.Serializer):
         return value
         
     def validate(self, attrs):
-        """Validate password confirmation"""
+        """
+        Validate password confirmation, then the old password. The old
+        password is hashed last, only once every cheap check has passed.
+        """
         if attrs['new_password'] != attrs['new_password_confirm']:
             raise serializers.ValidationError({
                 'new_password_confirm': 'Yangi parollar mos kelmaydi.'
             })
+        if attrs['new_password'] == attrs['old_password']:
+            raise serializers.ValidationError({
+                'new_password': 'Yangi parol eskisidan farq qilishi kerak.'
+            })
+        user = self.context['request'].user
+        if not user.check_password(attrs['old_password']):
+            raise serializers.ValidationError({
+                'old_password': 'Eski parol noto\'g\'ri.'
+            })
         return attrs
         
     def save(self):
@@ -401,14 +364,8 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         username = attrs.get('username')
         password = attrs.get('password')
         
-        # Try to get user by email if username is email format
-        if '@' in username:
-            try:
-                user = User.objects.get(email=username)
-                attrs['username'] = user.username
-            except User.DoesNotExist:
-                pass
-                
+        attrs['username'] = resolve_login_username(username)
+        
         data = super().validate(attrs)
         
         # Add user data to response
@@ -428,14 +385,13 @@ class AvatarUploadSerializer(serializers.ModelSerializer):
         """Validate avatar file"""
         if value:
             # Check file size (max 5MB)
-            if value.size > 5 * 1024 * 1024:
+            if value.size > AVATAR_MAX_SIZE:
                 raise serializers.ValidationError(
                     "Rasm hajmi 5MB dan oshmasligi kerak."
                 )
             
             # Check file type
-            allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-            if value.content_type not in allowed_types:
+            if value.content_type not in AVATAR_CONTENT_TYPES:
                 raise serializers.ValidationError(
                     "Faqat JPEG, PNG, GIF, WEBP formatidagi rasmlar qabul qilinadi."
                 )
@@ -459,21 +415,22 @@ class ProductImageSerializer(serializers.ModelSerializer):
             'is_primary', 'order',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'image_url']
+        read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_image_url(self, obj):
         """Get full URL for the image"""
-        if obj.image and hasattr(obj.image, 'url'):
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
+        if not obj.image:
+            return None
+        # A named file always has a url, so read it once
+        url = obj.image.url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
 
 
 class ProductCategorySerializer(serializers.ModelSerializer):
     """Serializer for ProductCategory model"""
     
+    # Annotated by ProductCategoryViewSet; counted per row when nested
     products_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -485,16 +442,25 @@ class ProductCategorySerializer(serializers.ModelSerializer):
             'products_count',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'products_count']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    @staticmethod
+    def products_count_annotation():
+        """Active products count as a correlated subquery, for annotate()"""
+        return count_related(Product, 'category', is_active=True, deleted_at__isnull=True)
     
     def get_products_count(self, obj):
         """Get active products count for this category"""
-        return obj.products.filter(is_active=True, deleted_at__isnull=True).count()
+        products_count = getattr(obj, 'products_count', None)
+        if products_count is None:
+            products_count = obj.products.filter(is_active=True, deleted_at__isnull=True).count()
+        return products_count
 
 
 class ProductTagSerializer(serializers.ModelSerializer):
     """Serializer for ProductTag model"""
     
+    # Annotated by ProductTagViewSet and the product tag prefetch
     products_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -505,14 +471,26 @@ class ProductTagSerializer(serializers.ModelSerializer):
             'products_count',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'products_count']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    @staticmethod
+    def products_count_annotation():
+        """Active products count as a correlated subquery, for annotate()"""
+        # Counted through the M2M table so the outer tag join is never reused
+        return count_related(
+            Product.tags.through, 'producttag',
+            product__is_active=True, product__deleted_at__isnull=True,
+        )
     
     def get_products_count(self, obj):
         """Get active products count for this tag"""
-        return obj.products.filter(is_active=True, deleted_at__isnull=True).count()
+        products_count = getattr(obj, 'products_count', None)
+        if products_count is None:
+            products_count = obj.products.filter(is_active=True, deleted_at__isnull=True).count()
+        return products_count
 
 
-class ProductListSerializer(serializers.ModelSerializer):
+class ProductListSerializer(LocalizedSerializerMixin, serializers.ModelSerializer):
     """Lightweight serializer for product list views"""
     
     category = serializers.StringRelatedField()
@@ -521,8 +499,9 @@ class ProductListSerializer(serializers.ModelSerializer):
     is_on_sale = serializers.ReadOnlyField()
     available_stock = serializers.ReadOnlyField()
     category_name = serializers.SerializerMethodField()
-    primary_image = serializers.SerializerMethodField()
-    images_count = serializers.ReadOnlyField()
+    # Bound once per list instead of a new serializer per row
+    primary_image = ProductImageSerializer(read_only=True)
+    images_count = serializers.IntegerField(source='image_count', read_only=True)
     
     class Meta:
         model = Product
@@ -537,26 +516,76 @@ class ProductListSerializer(serializers.ModelSerializer):
             'created_at'
         ]
     
+    # Columns the rows read, including those behind final_price,
+    # is_on_sale and available_stock; descriptions are never loaded
+    list_columns = (
+        'id', 'slug', 'name_uz', 'name_ru', 'name_en',
+        'category', 'price', 'sale_price', 'stock',
+        'is_active', 'deleted_at', 'is_featured', 'created_at',
+        'category__id', 'category__name_uz', 'category__name_ru', 'category__name_en',
+    )
+    
+    @staticmethod
+    def prefetch_relations(queryset):
+        """Category, tags (with products_count) and images of each product"""
+        tags = ProductTag.objects.annotate(
+            products_count=ProductTagSerializer.products_count_annotation()
+        )
+        return queryset.select_related('category').prefetch_related(
+            Prefetch('tags', queryset=tags), 'images',
+        )
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load only what the list rows read, in a fixed number of queries"""
+        return ProductListSerializer.prefetch_relations(queryset).only(
+            *ProductListSerializer.list_columns
+        )
+    
     def get_category_name(self, obj):
         """Get localized category name"""
-        language = self.context.get('language', 'uz')
-        if language == 'uz':
-            return obj.category.name_uz
-        elif language == 'ru':
-            return obj.category.name_ru
-        elif language == 'en':
-            return obj.category.name_en
-        return obj.category.name_uz
-    
-    def get_primary_image(self, obj):
-        """Get primary image for the product"""
-        primary_image = obj.primary_image
-        if primary_image:
-            return ProductImageSerializer(primary_image, context=self.context).data
-        return None
-
-
-class ProductDetailSerializer(serializers.ModelSerializer):
+        return localized(obj.category, 'name', self.language)
+
+
+class ProductValidationMixin:
+    """Field and cross-field validation shared by the product write serializers"""
+    
+    def validate_price(self, value):
+        """Validate product price"""
+        if value <= 0:
+            raise serializers.ValidationError("Narx 0 dan katta bo'lishi kerak.")
+        return value
+    
+    def validate_sale_price(self, value):
+        """Validate sale price"""
+        if value is not None and value <= 0:
+            raise serializers.ValidationError("Chegirmali narx 0 dan katta bo'lishi kerak.")
+        return value
+    
+    def validate_stock(self, value):
+        """Validate stock"""
+        if value < 0:
+            raise serializers.ValidationError("Zaxira soni manfiy bo'lishi mumkin emas.")
+        return value
+    
+    def validate(self, data):
+        """Cross-field validation"""
+        # Partial updates that touch neither price have nothing to compare
+        if 'price' not in data and 'sale_price' not in data:
+            return data
+        
+        price = data.get('price')
+        sale_price = data.get('sale_price')
+        
+        if sale_price and price and sale_price >= price:
+            raise serializers.ValidationError({
+                'sale_price': 'Chegirmali narx asosiy narxdan kichik bo\'lishi kerak.'
+            })
+        
+        return data
+
+
+class ProductDetailSerializer(LocalizedSerializerMixin, ProductValidationMixin, serializers.ModelSerializer):
     """Detailed serializer for single product views"""
     
     category = ProductCategorySerializer(read_only=True)
@@ -566,14 +595,14 @@ class ProductDetailSerializer(serializers.ModelSerializer):
         write_only=True
     )
     tags = ProductTagSerializer(many=True, read_only=True)
-    tag_ids = serializers.PrimaryKeyRelatedField(
+    tag_ids = BulkPrimaryKeyRelatedField(
         queryset=ProductTag.objects.all(),
         many=True,
         source='tags',
         write_only=True
     )
     suggested_products = ProductListSerializer(many=True, read_only=True)
-    suggested_product_ids = serializers.PrimaryKeyRelatedField(
+    suggested_product_ids = BulkPrimaryKeyRelatedField(
         queryset=Product.objects.all(),
         many=True,
         source='suggested_products',
@@ -583,8 +612,8 @@ class ProductDetailSerializer(serializers.ModelSerializer):
     
     # Image fields
     images = ProductImageSerializer(many=True, read_only=True)
-    primary_image = serializers.SerializerMethodField()
-    images_count = serializers.ReadOnlyField()
+    primary_image = ProductImageSerializer(read_only=True)
+    images_count = serializers.IntegerField(source='image_count', read_only=True)
     
     # Computed fields
     final_price = serializers.ReadOnlyField()
@@ -616,112 +645,60 @@ class ProductDetailSerializer(serializers.ModelSerializer):
             'display_name',
             'created_at', 'updated_at', 'deleted_at'
         ]
-        read_only_fields = [
-            'id', 'slug', 'final_price', 'is_on_sale', 'available_stock',
-            'display_name', 'images_count', 'created_at', 'updated_at', 'deleted_at'
-        ]
+        read_only_fields = ['id', 'slug', 'created_at', 'updated_at', 'deleted_at']
+    
+    @staticmethod
+    def setup_eager_loading(queryset, include_suggested=True):
+        """Full rows, plus the suggested products loaded as list rows"""
+        queryset = ProductListSerializer.prefetch_relations(queryset)
+        if not include_suggested:
+            return queryset
+        suggested = ProductListSerializer.setup_eager_loading(Product.objects.all())
+        return queryset.prefetch_related(
+            Prefetch('suggested_products', queryset=suggested),
+        )
     
-    def get_primary_image(self, obj):
-        """Get primary image for the product"""
-        primary_image = obj.primary_image
-        if primary_image:
-            return ProductImageSerializer(primary_image, context=self.context).data
-        return None
+    def get_fields(self):
+        fields = super().get_fields()
+        # Set by ProductViewSet for ?suggested=false
+        if not self.context.get('include_suggested', True):
+            fields.pop('suggested_products')
+        return fields
     
     def get_localized_name(self, obj):
         """Get localized product name"""
-        language = self.context.get('language', 'uz')
-        if language == 'uz':
-            return obj.name_uz
-        elif language == 'ru':
-            return obj.name_ru
-        elif language == 'en':
-            return obj.name_en
-        return obj.name_uz
+        return localized(obj, 'name', self.language)
     
     def get_localized_description(self, obj):
         """Get localized product description"""
-        language = self.context.get('language', 'uz')
-        if language == 'uz':
-            return obj.description_uz
-        elif language == 'ru':
-            return obj.description_ru
-        elif language == 'en':
-            return obj.description_en
-        return obj.description_uz
+        return localized(obj, 'description', self.language)
     
     def get_localized_category_name(self, obj):
         """Get localized category name"""
-        language = self.context.get('language', 'uz')
-        if language == 'uz':
-            return obj.category.name_uz
-        elif language == 'ru':
-            return obj.category.name_ru
-        elif language == 'en':
-            return obj.category.name_en
-        return obj.category.name_uz
+        return localized(obj.category, 'name', self.language)
     
     def get_localized_tags(self, obj):
         """Get localized tag names"""
-        language = self.context.get('language', 'uz')
-        tags = []
-        for tag in obj.tags.all():
-            if language == 'uz':
-                tags.append(tag.name_uz)
-            elif language == 'ru':
-                tags.append(tag.name_ru)
-            elif language == 'en':
-                tags.append(tag.name_en)
-            else:
-                tags.append(tag.name_uz)
-        return tags
-    
-    def validate_price(self, value):
-        """Validate product price"""
-        if value <= 0:
-            raise serializers.ValidationError("Narx 0 dan katta bo'lishi kerak.")
-        return value
-    
-    def validate_sale_price(self, value):
-        """Validate sale price"""
-        if value is not None and value <= 0:
-            raise serializers.ValidationError("Chegirmali narx 0 dan katta bo'lishi kerak.")
-        return value
-    
-    def validate_stock(self, value):
-        """Validate stock"""
-        if value < 0:
-            raise serializers.ValidationError("Zaxira soni manfiy bo'lishi mumkin emas.")
-        return value
-    
-    def validate(self, data):
-        """Cross-field validation"""
-        price = data.get('price')
-        sale_price = data.get('sale_price')
-        
-        if sale_price and price and sale_price >= price:
-            raise serializers.ValidationError({
-                'sale_price': 'Chegirmali narx asosiy narxdan kichik bo\'lishi kerak.'
-            })
-        
-        return data
+        language = self.language
+        return [localized(tag, 'name', language) for tag in obj.tags.all()]
 
 
-class ProductCreateUpdateSerializer(serializers.ModelSerializer):
+class ProductCreateUpdateSerializer(ProductValidationMixin, serializers.ModelSerializer):
     """Serializer for creating and updating products"""
     
+    # Related objects are only assigned and rendered back as IDs
     category_id = serializers.PrimaryKeyRelatedField(
-        queryset=ProductCategory.objects.all(),
+        queryset=ProductCategory.objects.only('id'),
         source='category'
     )
-    tag_ids = serializers.PrimaryKeyRelatedField(
-        queryset=ProductTag.objects.all(),
+    tag_ids = BulkPrimaryKeyRelatedField(
+        queryset=ProductTag.objects.only('id'),
         many=True,
         source='tags',
         required=False
     )
-    suggested_product_ids = serializers.PrimaryKeyRelatedField(
-        queryset=Product.objects.all(),
+    suggested_product_ids = BulkPrimaryKeyRelatedField(
+        queryset=Product.objects.only('id'),
         many=True,
         source='suggested_products',
         required=False
@@ -738,36 +715,6 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
             'suggested_product_ids'
         ]
     
-    def validate_price(self, value):
-        """Validate product price"""
-        if value <= 0:
-            raise serializers.ValidationError("Narx 0 dan katta bo'lishi kerak.")
-        return value
-    
-    def validate_sale_price(self, value):
-        """Validate sale price"""
-        if value is not None and value <= 0:
-            raise serializers.ValidationError("Chegirmali narx 0 dan katta bo'lishi kerak.")
-        return value
-    
-    def validate_stock(self, value):
-        """Validate stock"""
-        if value < 0:
-            raise serializers.ValidationError("Zaxira soni manfiy bo'lishi mumkin emas.")
-        return value
-    
-    def validate(self, data):
-        """Cross-field validation"""
-        price = data.get('price')
-        sale_price = data.get('sale_price')
-        
-        if sale_price and price and sale_price >= price:
-            raise serializers.ValidationError({
-                'sale_price': 'Chegirmali narx asosiy narxdan kichik bo\'lishi kerak.'
-            })
-        
-        return data
-    
     def create(self, validated_data):
         """Create product with proper slug generation"""
         tags = validated_data.pop('tags', [])
@@ -775,10 +722,11 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
         
         product = Product.objects.create(**validated_data)
         
+        # A new product has no relations yet, so add() skips set()'s diff query
         if tags:
-            product.tags.set(tags)
+            product.tags.add(*tags)
         if suggested_products:
-            product.suggested_products.set(suggested_products)
+            product.suggested_products.add(*suggested_products)
         
         return product
     
@@ -793,10 +741,11 @@ class ProductCreateUpdateSerializer(serializers.ModelSerializer):
         instance.save()
         
         # Update many-to-many relationships
+        # clear=True replaces the rows outright instead of reading them to diff
         if tags is not None:
-            instance.tags.set(tags)
+            instance.tags.set(tags, clear=True)
         if suggested_products is not None:
-            instance.suggested_products.set(suggested_products)
+            instance.suggested_products.set(suggested_products, clear=True)
         
         return instance
 
@@ -79,12 +79,22 @@ class AuthenticationAPITestCase(APITestCase):
         invalid_data['username'] = 'existinguser'
         response = self.client.post(self.registration_url, invalid_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data)
         
         # Test duplicate email
         invalid_data = self.test_user_data.copy()
         invalid_data['email'] = 'existing@example.com'
         response = self.client.post(self.registration_url, invalid_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        self.assertNotIn('username', response.data)
+        
+        # Test username with characters outside [a-zA-Z0-9_]
+        invalid_data = self.test_user_data.copy()
+        invalid_data['username'] = 'test-user'
+        response = self.client.post(self.registration_url, invalid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data)
     
     def test_user_login_success(self):
         """Test successful user login"""
@@ -113,6 +123,22 @@ class AuthenticationAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['user']['username'], 'existinguser')
     
+    def test_user_login_prefers_username_over_email(self):
+        """Test a username containing @ logs in as its own account"""
+        User.objects.create_user(
+            username='existing@example.com',
+            email='other@example.com',
+            password='otherpass123'
+        )
+        for url in (self.login_url, self.token_url):
+            response = self.client.post(url, {
+                'username': 'existing@example.com',
+                'password': 'otherpass123'
+            })
+            
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['user']['username'], 'existing@example.com')
+    
     def test_user_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         login_data = {
@@ -222,6 +248,22 @@ class AuthenticationAPITestCase(APITestCase):
         
         response = self.client.post(self.change_password_url, password_data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('old_password', response.data)
+    
+    def test_change_password_same_as_old(self):
+        """Test the new password must differ from the old one"""
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        
+        password_data = {
+            'old_password': 'existingpass123',
+            'new_password': 'existingpass123',
+            'new_password_confirm': 'existingpass123'
+        }
+        
+        response = self.client.post(self.change_password_url, password_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('new_password', response.data)
     
     def test_logout(self):
         """Test user logout"""
@@ -3,11 +3,12 @@ Comprehensive tests for Products API
 """
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from apps.products.models import Product, ProductCategory, ProductTag
+from apps.products.models import Product, ProductCategory, ProductTag, ProductImage
 from decimal import Decimal
 
 User = get_user_model()
@@ -17,6 +18,8 @@ class ProductAPITestCase(APITestCase):
     
     def setUp(self):
         """Set up test data"""
+        cache.clear()
+        
         # Create test user
         self.user = User.objects.create_user(
             username='testuser',
@@ -118,6 +121,43 @@ class ProductAPITestCase(APITestCase):
         product = response.data['results'][0]
         self.assertIn('name_ru', product)
     
+    def test_product_list_includes_images(self):
+        """Test primary image and image count come from the prefetched images"""
+        ProductImage.objects.create(product=self.product1, image='products/a.jpg', order=0)
+        ProductImage.objects.create(
+            product=self.product1, image='products/b.jpg', order=1, is_primary=True
+        )
+        
+        # Staff responses bypass the list cache
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.get_jwt_token(self.admin_user)}')
+        url = reverse('api:product-list')
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        products = {product['id']: product for product in response.data['results']}
+        product = products[str(self.product1.id)]
+        self.assertEqual(product['images_count'], 2)
+        self.assertTrue(product['primary_image']['is_primary'])
+        self.assertEqual(products[str(self.product2.id)]['images_count'], 0)
+        self.assertIsNone(products[str(self.product2.id)]['primary_image'])
+    
+    def test_products_count_counts_active_products(self):
+        """Test products_count on categories, tags and nested tags"""
+        self.inactive_product.tags.add(self.tag1)
+        
+        response = self.client.get(reverse('api:category-list'))
+        self.assertEqual(response.data['results'][0]['products_count'], 2)
+        
+        response = self.client.get(reverse('api:tag-list'))
+        counts = {tag['name_uz']: tag['products_count'] for tag in response.data['results']}
+        self.assertEqual(counts, {'Tag 1': 2, 'Tag 2': 1})
+        
+        url = reverse('api:product-detail', kwargs={'pk': self.product2.pk})
+        response = self.client.get(url)
+        counts = {tag['name_uz']: tag['products_count'] for tag in response.data['tags']}
+        self.assertEqual(counts, {'Tag 1': 2, 'Tag 2': 1})
+        self.assertEqual(response.data['category']['products_count'], 2)
+    
     def test_product_detail_public(self):
         """Test public access to product detail"""
         url = reverse('api:product-detail', kwargs={'pk': self.product1.pk})
@@ -125,6 +165,16 @@ class ProductAPITestCase(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name_uz'], 'Test Product 1')
+        self.assertIn('suggested_products', response.data)
+    
+    def test_product_detail_without_suggested(self):
+        """?suggested=false leaves suggested products out of the detail"""
+        self.product1.suggested_products.add(self.product2)
+        url = reverse('api:product-detail', kwargs={'pk': self.product1.pk})
+        response = self.client.get(url, {'suggested': 'false'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('suggested_products', response.data)
     
     def test_product_create_authenticated(self):
         """Test product creation with authentication"""
@@ -148,6 +198,26 @@ class ProductAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Product.objects.count(), 4)  # 3 existing + 1 new
     
+    def test_product_create_unknown_tag(self):
+        """Unknown tag IDs are rejected under tag_ids"""
+        token = self.get_jwt_token(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        url = reverse('api:product-list')
+        data = {
+            'name_uz': 'New Product',
+            'name_ru': 'Новый Продукт',
+            'name_en': 'New Product',
+            'price': '25.00',
+            'stock': 75,
+            'category_id': self.category.id,
+            'tag_ids': [self.tag1.id, 999999],
+        }
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tag_ids', response.data)
+    
     def test_product_create_unauthenticated(self):
         """Test product creation without authentication"""
         url = reverse('api:product-list')
@@ -276,6 +346,24 @@ class ProductAPITestCase(APITestCase):
         for field in expected_fields:
             self.assertIn(field, response.data)
     
+    def test_product_stats_cached(self):
+        """Repeated stats requests are served from the cache"""
+        url = reverse('api:product-stats')
+        token = self.get_jwt_token(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        first = self.client.get(url)
+        Product.objects.create(
+            name_uz='Cached Product',
+            name_ru='Кэш Продукт',
+            name_en='Cached Product',
+            price=Decimal('5.00'),
+            stock=10,
+            category=self.category
+        )
+        second = self.client.get(url)
+        self.assertEqual(second.data['total_products'], first.data['total_products'])
+    
     def test_api_health_check(self):
         """Test API health check endpoint"""
         url = reverse('api:api-health')
@@ -1,10 +1,16 @@
 """
 Tests for Admin API endpoints
 """
+import csv
 import pytest
+from datetime import timedelta
 from decimal import Decimal
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Value
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -13,11 +19,12 @@ from rest_framework_simplejwt.tokens import RefreshToken
 # Models
 from accounts.models import User
 from apps.products.models import Product, ProductCategory, ProductTag
-from apps.order.models import Order, OrderItem
+from apps.order.models import Order, OrderItem, OrderDailyRollup
 from apps.course.models import Application as CourseApplication
 from apps.franchise.models import FranchiseApplication
 from apps.cart.models import Cart, CartItem
 from apps.favorites.models import Favorite
+from api.admin_serializers import UserAdminSerializer
 
 User = get_user_model()
 
@@ -26,6 +33,9 @@ class BaseAdminAPITestCase(APITestCase):
     """Base test case for admin API tests"""
     
     def setUp(self):
+        # Dashboard payloads and page counts are cached between requests
+        cache.clear()
+        
         # Create admin user
         self.admin_user = User.objects.create_user(
             username='admin',
@@ -103,6 +113,8 @@ class UserAdminAPITest(BaseAdminAPITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(User.objects.filter(username='newuser').exists())
+        self.assertEqual(response.data['orders_count'], 0)
+        self.assertEqual(response.data['total_spent'], '0.00')
     
     def test_admin_can_update_user(self):
         """Test admin can update user details"""
@@ -119,7 +131,68 @@ class UserAdminAPITest(BaseAdminAPITestCase):
         self.regular_user.refresh_from_db()
         self.assertEqual(self.regular_user.first_name, 'Updated')
         self.assertTrue(self.regular_user.is_verified)
-    
+
+    def test_user_list_includes_order_aggregates(self):
+        """Test orders_count and total_spent come from queryset annotations"""
+        Order.objects.create(user=self.regular_user, subtotal=Decimal('10.00'))
+        Order.objects.create(user=self.regular_user, subtotal=Decimal('15.50'))
+
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        users = {user['username']: user for user in response.data['results']}
+        self.assertEqual(users['user']['orders_count'], 2)
+        self.assertEqual(users['user']['total_spent'], '25.50')
+        self.assertEqual(users['admin']['orders_count'], 0)
+        self.assertEqual(users['admin']['total_spent'], '0.00')
+
+    def test_missing_count_annotation_raises(self):
+        """Test an ObjectCountField without its annotation raises instead of vanishing"""
+        with self.assertRaises(ImproperlyConfigured):
+            UserAdminSerializer(self.regular_user).data
+
+    def test_missing_total_spent_annotation_raises(self):
+        """Test total_spent without its annotation raises instead of vanishing"""
+        user = User.objects.annotate(orders_count=Value(0)).get(pk=self.regular_user.pk)
+        with self.assertRaisesMessage(ImproperlyConfigured, 'total_spent'):
+            UserAdminSerializer(user).data
+
+    def test_user_list_fields_limiting(self):
+        """Test ?fields= narrows the response and skips unused counts"""
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+        response = self.client.get(url, {'fields': 'id,username'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for user in response.data['results']:
+            self.assertEqual(set(user), {'id', 'username'})
+
+    def test_user_list_csv_export(self):
+        """Test ?export=csv streams every matching user with the list columns"""
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+        response = self.client.get(url, {'export': 'csv', 'fields': 'username,email'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'username,email')
+        self.assertEqual(sorted(lines[1:]), ['admin,admin@test.com', 'user,user@test.com'])
+
+    def test_user_list_csv_export_escapes_formulas(self):
+        """Test ?export=csv prefixes formula-like text cells with a quote"""
+        self.regular_user.first_name = '=HYPERLINK("http://evil.test")'
+        self.regular_user.save()
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+        response = self.client.get(url, {'export': 'csv', 'fields': 'username,first_name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertIn(['user', '\'=HYPERLINK("http://evil.test")'], rows)
+
     def test_user_activity_endpoint(self):
         """Test user activity statistics endpoint"""
         self.authenticate_admin()
@@ -162,7 +235,35 @@ class ProductAdminAPITest(BaseAdminAPITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
-    
+
+    def test_product_list_includes_related_counts(self):
+        """Test orders_count and favorites_count come from queryset annotations"""
+        order = Order.objects.create(user=self.regular_user, subtotal=Decimal('20.00'))
+        OrderItem.objects.create(
+            order=order, product=self.product, product_name=self.product.name_uz,
+            quantity=2, unit_price=Decimal('10.00')
+        )
+        Favorite.objects.create(user=self.regular_user, product=self.product)
+        Favorite.objects.create(user=self.admin_user, product=self.product)
+
+        self.authenticate_admin()
+        url = reverse('api:admin-products-list')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product = response.data['results'][0]
+        self.assertEqual(product['orders_count'], 1)
+        self.assertEqual(product['favorites_count'], 2)
+
+    def test_product_list_fields_limiting(self):
+        """Test ?fields= keeps the columns select_related and properties need"""
+        self.authenticate_admin()
+        url = reverse('api:admin-products-list')
+        response = self.client.get(url, {'fields': 'id,name_uz'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': str(self.product.id), 'name_uz': 'Test Product'}])
+
     def test_admin_can_create_product(self):
         """Test admin can create products"""
         self.authenticate_admin()
@@ -203,6 +304,130 @@ class ProductAdminAPITest(BaseAdminAPITestCase):
         self.assertIn('active_products', response.data)
 
 
+class OrderAdminAPITest(BaseAdminAPITestCase):
+    """Test Order Admin API"""
+
+    def test_order_detail_renders_items(self):
+        """Items are prefetched with only the columns the serializer reads"""
+        category = ProductCategory.objects.create(
+            name_uz='Test Category',
+            name_ru='Тест категория',
+            name_en='Test Category'
+        )
+        product = Product.objects.create(
+            name_uz='Test Product',
+            name_ru='Тест продукт',
+            name_en='Test Product',
+            slug='test-product',
+            price=Decimal('10.00'),
+            stock=100,
+            category=category
+        )
+        order = Order.objects.create(user=self.regular_user, subtotal=Decimal('20.00'))
+        OrderItem.objects.create(
+            order=order, product=product, product_name=product.name_uz,
+            quantity=2, unit_price=Decimal('10.00')
+        )
+
+        self.authenticate_admin()
+        url = reverse('api:admin-orders-detail', kwargs={'pk': order.pk})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['items_count'], 1)
+        item = response.data['items'][0]
+        self.assertEqual(item['product_name'], 'Test Product')
+        self.assertEqual(item['quantity'], 2)
+        self.assertEqual(item['total_price'], '20.00')
+
+    def test_order_list_fields_limiting(self):
+        """Test ?fields= on the order list keeps the user FK select_related follows"""
+        order = Order.objects.create(user=self.regular_user, subtotal=Decimal('20.00'))
+
+        self.authenticate_admin()
+        url = reverse('api:admin-orders-list')
+        for params in ({'fields': 'id,status'}, {'fields': 'id,status', 'cursor': ''}):
+            response = self.client.get(url, params)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.data['results'],
+                [{'id': str(order.id), 'status': order.status}]
+            )
+
+
+class OrderRevenueAPITest(BaseAdminAPITestCase):
+    """Test revenue stats combine daily rollups with live orders"""
+    
+    def create_order(self, total, order_status, days_ago=0):
+        order = Order.objects.create(subtotal=Decimal(total), status=order_status)
+        if days_ago:
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.now() - timedelta(days=days_ago)
+            )
+        return order
+    
+    def get_revenue(self):
+        self.authenticate_admin()
+        response = self.client.get(reverse('api:admin-orders-revenue'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+    
+    def test_revenue_uses_rollups_for_past_days(self):
+        """Fully rolled-up windows are read from the rollup"""
+        today = timezone.now().date()
+        self.create_order('40.00', 'completed', days_ago=3)
+        self.create_order('10.00', 'completed')
+        self.create_order('5.00', 'pending')
+        OrderDailyRollup.rebuild(today - timedelta(days=30), today - timedelta(days=1))
+        
+        data = self.get_revenue()
+        self.assertEqual(data['today_revenue'], Decimal('10.00'))
+        self.assertEqual(data['week_revenue'], Decimal('50.00'))
+        self.assertEqual(data['month_revenue'], Decimal('50.00'))
+        self.assertEqual(data['total_revenue'], Decimal('50.00'))
+        self.assertEqual(data['completed_orders'], 2)
+        self.assertEqual(data['pending_orders'], 1)
+    
+    def test_revenue_rollups_follow_order_changes(self):
+        """Status and total changes after a rebuild reach the rolled-up days"""
+        today = timezone.now().date()
+        changed = self.create_order('40.00', 'completed', days_ago=3)
+        cancelled = self.create_order('20.00', 'completed', days_ago=5)
+        OrderDailyRollup.rebuild(today - timedelta(days=30), today - timedelta(days=1))
+        changed.refresh_from_db()
+        changed.subtotal = Decimal('45.00')
+        changed.save()
+        cancelled.refresh_from_db()
+        cancelled.status = 'canceled'
+        cancelled.save()
+        
+        data = self.get_revenue()
+        self.assertEqual(data['week_revenue'], Decimal('45.00'))
+        self.assertEqual(data['month_revenue'], Decimal('45.00'))
+        self.assertEqual(data['total_revenue'], Decimal('45.00'))
+    
+    def test_revenue_with_partial_rollups(self):
+        """Orders outside the rolled-up days are still counted"""
+        today = timezone.now().date()
+        self.create_order('100.00', 'completed', days_ago=60)
+        self.create_order('40.00', 'completed', days_ago=20)
+        self.create_order('30.00', 'completed', days_ago=3)
+        pending = self.create_order('5.00', 'pending', days_ago=2)
+        # Covers the last week only, not the month or the full history
+        OrderDailyRollup.rebuild(today - timedelta(days=7), today - timedelta(days=1))
+        pending.refresh_from_db()
+        pending.status = 'completed'
+        pending.save()
+        
+        data = self.get_revenue()
+        self.assertEqual(data['week_revenue'], Decimal('35.00'))
+        self.assertEqual(data['month_revenue'], Decimal('75.00'))
+        self.assertEqual(data['total_revenue'], Decimal('175.00'))
+        self.assertEqual(data['completed_orders'], 4)
+        self.assertEqual(data['pending_orders'], 0)
+
+
 class DashboardStatsAPITest(BaseAdminAPITestCase):
     """Test Dashboard Statistics API"""
     
@@ -269,6 +494,18 @@ class DashboardStatsAPITest(BaseAdminAPITestCase):
         # Check franchise stats
         self.assertEqual(response.data['franchises']['total_applications'], 1)
     
+    def test_admin_summary(self):
+        """Test summary counts endpoint"""
+        self.authenticate_admin()
+        url = reverse('api:admin-summary')
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_users'], 2)  # admin + regular
+        self.assertEqual(response.data['staff_users'], 1)
+        self.assertEqual(response.data['total_orders'], 0)
+        self.assertEqual(response.data['total_products'], 1)
+    
     def test_applications_stats(self):
         """Test applications statistics endpoint"""
         self.authenticate_admin()
@@ -394,6 +631,37 @@ class PaginationTest(BaseAdminAPITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 7)  # Remaining users
 
+    def test_pagination_count_is_cached_until_first_page(self):
+        """Later pages reuse the count cached by the first page"""
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+
+        response = self.client.get(url, {'page': 1})
+        self.assertEqual(response.data['count'], 27)
+
+        User.objects.create_user(username='late', email='late@test.com', password='pass123')
+        response = self.client.get(url, {'page': 2})
+        self.assertEqual(response.data['count'], 27)
+
+        response = self.client.get(url, {'page': 1})
+        self.assertEqual(response.data['count'], 28)
+
+    def test_cursor_pagination(self):
+        """?cursor= switches to keyset pagination without a count"""
+        self.authenticate_admin()
+        url = reverse('api:admin-users-list')
+
+        response = self.client.get(url, {'cursor': ''})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIn('total_spent', response.data['results'][0])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
 
 # Run tests
 if __name__ == '__main__':
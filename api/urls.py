@@ -42,6 +42,7 @@ from api.admin_views import (
     CartAdminViewSet,
     FavoriteAdminViewSet,
     admin_dashboard_stats,
+    admin_summary,
 )
 
 # Create router for ViewSets
@@ -93,6 +94,7 @@ urlpatterns = [
     # Admin API routes
     path('admin/', include(admin_router.urls)),
     path('admin/dashboard/', admin_dashboard_stats, name='admin-dashboard'),
+    path('admin/summary/', admin_summary, name='admin-summary'),
     
     # Course API
     path('course/', include('apps.course.urls')),
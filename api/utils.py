@@ -2,10 +2,13 @@
 Utility functions for API
 """
 from django.core.cache import cache
-from django.db.models import Q
+from django.db.models import Q, Count, Sum, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
 from apps.products.models import Product
+import csv
 import hashlib
 
 
@@ -16,6 +19,66 @@ def generate_cache_key(prefix, params):
     return f"{prefix}_{params_hash}"
 
 
+class _Echo:
+    """Write target that hands each CSV line back instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+# Leading characters that make spreadsheet apps read a cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@')
+
+
+def csv_safe(value):
+    """Quote `value` with a leading ' if a spreadsheet would run it as a formula"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(header, rows):
+    """
+    Yield `header` and then each row of `rows` as an encoded CSV line.
+    Text cells that would be read as formulas are escaped with csv_safe().
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([csv_safe(value) for value in row])
+
+
+def count_related(model, field, **filters):
+    """
+    Correlated subquery counting `model` rows that point at the outer row
+    through `field`. Unlike Count() over a JOIN it never multiplies rows,
+    so several counts can be annotated on one queryset.
+    """
+    subquery = Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}, **filters)
+        .order_by()
+        .values(field)
+        .annotate(c=Count('*'))
+        .values('c')
+    )
+    return Coalesce(subquery, 0)
+
+
+def sum_related(model, field, expression, default=Decimal('0.00'), **filters):
+    """
+    Correlated subquery summing `expression` over `model` rows that point
+    at the outer row through `field`. Empty relations yield `default`.
+    """
+    subquery = Subquery(
+        model.objects.filter(**{field: OuterRef('pk')}, **filters)
+        .order_by()
+        .values(field)
+        .annotate(total=Sum(expression))
+        .values('total')
+    )
+    return Coalesce(subquery, Value(default))
+
+
 def search_products(query, language='uz'):
     """
     Advanced product search functionality
@@ -8,7 +8,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from api.throttling import AuthRateThrottle, LenientAnonRateThrottle
+from api.parsers import AvatarMultiPartParser
+from api.renderers import ORJSONRenderer
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django_filters.rest_framework import DjangoFilterBackend
@@ -32,6 +35,8 @@ logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+PRODUCT_STATS_CACHE_TIMEOUT = 60
+
 # Authentication Views
 
 class SimpleUserRegistrationView(generics.CreateAPIView):
@@ -402,18 +407,20 @@ class ProductCategoryViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        """Optimize queryset with prefetch"""
-        return ProductCategory.objects.prefetch_related('products').all()
+        """Active products count annotated in SQL"""
+        return ProductCategory.objects.annotate(
+            products_count=ProductCategorySerializer.products_count_annotation()
+        )
     
     @action(detail=True, methods=['get'])
     def products(self, request, pk=None):
         """Get products for specific category"""
         category = self.get_object()
-        products = Product.objects.filter(
+        products = ProductListSerializer.setup_eager_loading(Product.objects.filter(
             category=category,
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('category').prefetch_related('tags')
+        ))
         
         # Apply language context
         language = request.query_params.get('lang', 'uz')
@@ -437,18 +444,20 @@ class ProductTagViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        """Optimize queryset with prefetch"""
-        return ProductTag.objects.prefetch_related('products').all()
+        """Active products count annotated in SQL"""
+        return ProductTag.objects.annotate(
+            products_count=ProductTagSerializer.products_count_annotation()
+        )
     
     @action(detail=True, methods=['get'])
     def products(self, request, pk=None):
         """Get products for specific tag"""
         tag = self.get_object()
-        products = Product.objects.filter(
+        products = ProductListSerializer.setup_eager_loading(Product.objects.filter(
             tags=tag,
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('category').prefetch_related('tags')
+        ))
         
         # Apply language context
         language = request.query_params.get('lang', 'uz')
@@ -467,13 +476,19 @@ class ProductViewSet(viewsets.ModelViewSet):
     
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = StandardResultsSetPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
     # throttle_classes = [UserRateThrottle, AnonRateThrottle]  # Removed throttling for better UX
     
     def get_queryset(self):
         """Optimized queryset with proper prefetching"""
-        queryset = Product.objects.select_related('category').prefetch_related(
-            'tags', 'suggested_products', 'suggested_products__category'
-        )
+        queryset = Product.objects.all()
+        serializer_class = self.get_serializer_class()
+        if serializer_class is ProductDetailSerializer:
+            queryset = serializer_class.setup_eager_loading(
+                queryset, include_suggested=self.include_suggested()
+            )
+        elif hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
         
         # Apply custom filters
         queryset = ProductFilter.filter_queryset(queryset, self.request)
@@ -482,7 +497,7 @@ class ProductViewSet(viewsets.ModelViewSet):
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
-        if self.action == 'list':
+        if self.action in ['list', 'featured', 'on_sale']:
             return ProductListSerializer
         elif self.action in ['create', 'update', 'partial_update']:
             return ProductCreateUpdateSerializer
@@ -492,8 +507,13 @@ class ProductViewSet(viewsets.ModelViewSet):
         """Add language context to serializer"""
         context = super().get_serializer_context()
         context['language'] = self.request.query_params.get('lang', 'uz')
+        context['include_suggested'] = self.include_suggested()
         return context
     
+    def include_suggested(self):
+        """Detail responses embed suggested products unless ?suggested=false"""
+        return self.request.query_params.get('suggested', '').lower() != 'false'
+    
     def get_object(self):
         """
         Override get_object to support both UUID and slug lookup
@@ -602,12 +622,12 @@ class ProductViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             return Response({'error': 'Ruxsat yo\'q.'}, status=status.HTTP_403_FORBIDDEN)
         
-        low_stock_products = Product.objects.filter(
+        low_stock_products = ProductListSerializer.setup_eager_loading(Product.objects.filter(
             stock__lte=10,
             stock__gt=0,
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('category')
+        ))
         
         serializer = ProductListSerializer(low_stock_products, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
@@ -618,11 +638,11 @@ class ProductViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             return Response({'error': 'Ruxsat yo\'q.'}, status=status.HTTP_403_FORBIDDEN)
         
-        out_of_stock_products = Product.objects.filter(
+        out_of_stock_products = ProductListSerializer.setup_eager_loading(Product.objects.filter(
             stock=0,
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('category')
+        ))
         
         serializer = ProductListSerializer(out_of_stock_products, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
@@ -631,10 +651,10 @@ class ProductViewSet(viewsets.ModelViewSet):
     def suggested(self, request, pk=None):
         """Get suggested products for a specific product"""
         product = self.get_object()
-        suggested = product.suggested_products.filter(
+        suggested = ProductListSerializer.setup_eager_loading(product.suggested_products.filter(
             is_active=True,
             deleted_at__isnull=True
-        ).select_related('category').prefetch_related('tags')
+        ))
         
         serializer = ProductListSerializer(suggested, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
@@ -645,30 +665,36 @@ class ProductViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             return Response({'error': 'Ruxsat yo\'q.'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Calculate statistics
-        all_products = Product.objects.all()
-        active_products = all_products.filter(is_active=True, deleted_at__isnull=True)
-        
-        stats = {
-            'total_products': all_products.count(),
-            'active_products': active_products.count(),
-            'featured_products': active_products.filter(is_featured=True).count(),
-            'out_of_stock': active_products.filter(stock=0).count(),
-            'low_stock': active_products.filter(stock__lte=10, stock__gt=0).count(),
-            'on_sale': active_products.filter(
+        # Dashboards poll this; every figure is a full-table aggregate
+        data = cache.get_or_set(
+            'products:stats', self._stats_payload, PRODUCT_STATS_CACHE_TIMEOUT
+        )
+        return Response(data)
+    
+    @staticmethod
+    def _stats_payload():
+        """Compute the serialized product statistics"""
+        # One conditional aggregate over the products table
+        active = Q(is_active=True, deleted_at__isnull=True)
+        stats = Product.objects.aggregate(
+            total_products=Count('id'),
+            active_products=Count('id', filter=active),
+            featured_products=Count('id', filter=active & Q(is_featured=True)),
+            out_of_stock=Count('id', filter=active & Q(stock=0)),
+            low_stock=Count('id', filter=active & Q(stock__lte=10, stock__gt=0)),
+            on_sale=Count('id', filter=active & Q(
                 sale_price__isnull=False,
                 sale_price__lt=F('price')
-            ).count(),
-            'categories_count': ProductCategory.objects.count(),
-            'tags_count': ProductTag.objects.count(),
-            'average_price': active_products.aggregate(avg_price=Avg('price'))['avg_price'] or 0,
-            'total_stock_value': active_products.aggregate(
-                total_value=Sum(F('price') * F('stock'))
-            )['total_value'] or 0
-        }
+            )),
+            average_price=Avg('price', filter=active),
+            total_stock_value=Sum(F('price') * F('stock'), filter=active),
+        )
+        stats['average_price'] = stats['average_price'] or 0
+        stats['total_stock_value'] = stats['total_stock_value'] or 0
+        stats['categories_count'] = ProductCategory.objects.count()
+        stats['tags_count'] = ProductTag.objects.count()
         
-        serializer = ProductStatsSerializer(stats)
-        return Response(serializer.data)
+        return dict(ProductStatsSerializer(stats).data)
 
 
 # User Management Views
@@ -681,6 +707,7 @@ class AvatarUploadView(generics.UpdateAPIView):
     """
     serializer_class = AvatarUploadSerializer
     permission_classes = [IsAuthenticated]
+    parser_classes = [AvatarMultiPartParser]
     
     def get_object(self):
         """Return current authenticated user"""
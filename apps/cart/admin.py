@@ -49,7 +49,10 @@ class CartAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         """Optimize queryset with select_related"""
-        return super().get_queryset(request).select_related('user')
+        # total_items and total_price iterate items and their products
+        return super().get_queryset(request).select_related('user').prefetch_related(
+            'items__product'
+        )
 
 
 @admin.register(CartItem)
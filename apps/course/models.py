@@ -26,6 +26,10 @@ class Application(models.Model):
         verbose_name = "Kursga ariza"
         verbose_name_plural = "Kursga arizalar"
         ordering = ['-created_at']
+        indexes = [
+            # Groups the popular courses ranking
+            models.Index(fields=['course_name']),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.course_name}"
@@ -37,6 +37,10 @@ class Favorite(models.Model):
         # Ensure uniqueness: one user cannot favorite the same product twice
         unique_together = ('user', 'product')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['-created_at']),
+        ]
         
     def __str__(self):
         return f"{self.user.username} - {self.product.name_uz}"
@@ -7,7 +7,7 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Count, Avg, F
+from django.db.models import Count, Avg, F, Q
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from apps.products.models import Product
@@ -271,18 +271,20 @@ class FavoriteViewSet(viewsets.ModelViewSet):
         try:
             favorites = self.get_queryset()
             
-            # Calculate statistics
-            total_favorites = favorites.count()
+            # Totals, distinct categories, price and sale counts in one query
+            stats_data = favorites.aggregate(
+                total_favorites=Count('id'),
+                categories_count=Count('product__category', distinct=True),
+                average_price=Avg('product__price'),
+                on_sale_count=Count('id', filter=Q(
+                    product__sale_price__isnull=False,
+                    product__sale_price__lt=F('product__price')
+                )),
+            )
+            stats_data['average_price'] = stats_data['average_price'] or 0
+            stats_data['most_favorited_category'] = None
             
-            if total_favorites == 0:
-                stats_data = {
-                    'total_favorites': 0,
-                    'categories_count': 0,
-                    'most_favorited_category': None,
-                    'average_price': 0,
-                    'on_sale_count': 0
-                }
-            else:
+            if stats_data['total_favorites']:
                 # Get category statistics
                 category_stats = favorites.values(
                     'product__category__name_uz'
@@ -290,33 +292,8 @@ class FavoriteViewSet(viewsets.ModelViewSet):
                     count=Count('id')
                 ).order_by('-count').first()
                 
-                most_favorited_category = (
-                    category_stats['product__category__name_uz'] 
-                    if category_stats else None
-                )
-                
-                categories_count = favorites.values(
-                    'product__category'
-                ).distinct().count()
-                
-                # Price statistics
-                price_stats = favorites.aggregate(
-                    avg_price=Avg('product__price')
-                )
-                
-                # On sale count
-                on_sale_count = favorites.filter(
-                    product__sale_price__isnull=False,
-                    product__sale_price__lt=F('product__price')
-                ).count()
-                
-                stats_data = {
-                    'total_favorites': total_favorites,
-                    'categories_count': categories_count,
-                    'most_favorited_category': most_favorited_category,
-                    'average_price': price_stats['avg_price'] or 0,
-                    'on_sale_count': on_sale_count
-                }
+                if category_stats:
+                    stats_data['most_favorited_category'] = category_stats['product__category__name_uz']
             
             serializer = FavoriteStatsSerializer(stats_data)
             return Response(serializer.data)
@@ -74,6 +74,17 @@ class FranchiseApplication(models.Model):
         verbose_name = 'Franshiza arizasi'
         verbose_name_plural = 'Franshiza arizalari'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            # Groups the popular cities ranking
+            models.Index(fields=['city']),
+            # Investment totals are summed over approved applications only
+            models.Index(
+                fields=['investment_amount'],
+                condition=models.Q(status='approved'),
+                name='franchise_approved_invest_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.city} ({self.status})"
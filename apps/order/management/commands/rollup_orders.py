@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.order.models import Order, OrderDailyRollup
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild daily order rollups for recent complete days. Run it nightly '
+        '(e.g. from cron); stats fall back to live queries for any day it missed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Number of complete days to rebuild, ending yesterday (default: 30)',
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every day since the first order',
+        )
+
+    def handle(self, *args, **options):
+        end = timezone.now().date() - timedelta(days=1)
+        if options['all']:
+            first = Order.objects.aggregate(first=Min('created_at'))['first']
+            if first is None:
+                self.stdout.write('No orders to roll up.')
+                return
+            start = first.date()
+        else:
+            start = end - timedelta(days=options['days'] - 1)
+
+        OrderDailyRollup.rebuild(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rolled up orders from {start} to {end}'))
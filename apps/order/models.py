@@ -2,8 +2,11 @@
 Order models for Organic Green e-commerce
 """
 import uuid
+from datetime import timedelta
 from decimal import Decimal
 from django.db import models, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.validators import MinValueValidator
@@ -156,6 +159,7 @@ class Order(models.Model):
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['session_key', 'created_at']),
             models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['-created_at']),
         ]
     
     def __str__(self):
@@ -263,3 +267,68 @@ class OrderItem(models.Model):
         """Override save to calculate total_price"""
         self.total_price = self.quantity * self.unit_price
         super().save(*args, **kwargs)
+
+
+class OrderDailyRollup(models.Model):
+    """
+    Order count and revenue per day and status.
+    Holds complete days only; rebuilt by the `rollup_orders` command so
+    stats endpoints can sum a few rows instead of scanning every order.
+    Every rebuilt day gets a row per status, zero or not, so a day without
+    rows is one the rollup does not cover. Order signals refresh a covered
+    day when one of its orders changes status or total, or is deleted;
+    queryset.update() skips them and waits for the nightly rebuild.
+    """
+    date = models.DateField(help_text="Order creation day")
+    status = models.CharField(max_length=16, help_text="Order status")
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Sum of total_price"
+    )
+    
+    class Meta:
+        db_table = 'orders_daily_rollup'
+        verbose_name = 'Kunlik buyurtma hisoboti'
+        verbose_name_plural = 'Kunlik buyurtma hisobotlari'
+        unique_together = ('date', 'status')
+    
+    def __str__(self):
+        return f"{self.date} {self.status}: {self.order_count}"
+    
+    @classmethod
+    def rebuild(cls, start, end):
+        """Recompute the rows for days start..end (inclusive) from Order"""
+        rows = (
+            Order.objects.filter(created_at__gte=start, created_at__lt=end + timedelta(days=1))
+            .annotate(day=TruncDate('created_at'))
+            .values('day', 'status')
+            .annotate(order_count=Count('id'), revenue=Sum('total_price'))
+            .order_by()
+        )
+        rollups = {
+            (row['day'], row['status']): cls(
+                date=row['day'],
+                status=row['status'],
+                order_count=row['order_count'],
+                revenue=row['revenue'] or Decimal('0.00'),
+            )
+            for row in rows
+        }
+        # Zero rows mark days (and statuses) without orders as covered
+        day = start
+        while day <= end:
+            for status in OrderStatus.values:
+                rollups.setdefault((day, status), cls(date=day, status=status))
+            day += timedelta(days=1)
+        with transaction.atomic():
+            cls.objects.filter(date__gte=start, date__lte=end).delete()
+            cls.objects.bulk_create(rollups.values())
+    
+    @classmethod
+    def refresh_day(cls, day):
+        """Rebuild `day` if the rollup already covers it"""
+        if cls.objects.filter(date=day).exists():
+            cls.rebuild(day, day)
@@ -1,8 +1,8 @@
-"""Order signals for notifications"""
-from django.db.models.signals import post_save, pre_save
+"""Order signals for notifications and daily rollups"""
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.db import transaction
-from .models import Order
+from .models import Order, OrderDailyRollup
 from .utils import notify_admins_new_order, notify_customer_order_status
 
 
@@ -12,10 +12,13 @@ def cache_old_status(sender, instance: Order, **kwargs):
         try:
             old = Order.objects.get(pk=instance.pk)
             instance._old_status = old.status  # type: ignore[attr-defined]
+            instance._old_total_price = old.total_price  # type: ignore[attr-defined]
         except Order.DoesNotExist:  # pragma: no cover
             instance._old_status = None  # type: ignore[attr-defined]
+            instance._old_total_price = None  # type: ignore[attr-defined]
     else:
         instance._old_status = None  # type: ignore[attr-defined]
+        instance._old_total_price = None  # type: ignore[attr-defined]
 
 
 @receiver(post_save, sender=Order)
@@ -34,3 +37,20 @@ def order_created_or_updated(sender, instance: Order, created: bool, **kwargs):
         transaction.on_commit(after_commit_notifications)
     except Exception:
         after_commit_notifications()
+
+
+@receiver(post_save, sender=Order)
+def refresh_rollup_on_change(sender, instance: Order, created: bool, **kwargs):
+    """Keep a rolled-up day in step when one of its orders changes"""
+    if created:
+        return
+    if (
+        instance._old_status != instance.status  # type: ignore[attr-defined]
+        or instance._old_total_price != instance.total_price  # type: ignore[attr-defined]
+    ):
+        OrderDailyRollup.refresh_day(instance.created_at.date())
+
+
+@receiver(post_delete, sender=Order)
+def refresh_rollup_on_delete(sender, instance: Order, **kwargs):
+    OrderDailyRollup.refresh_day(instance.created_at.date())
@@ -84,6 +84,14 @@ class Product(models.Model):
     class Meta:
         verbose_name = "Mahsulot"
         verbose_name_plural = "Mahsulotlar"
+        indexes = [
+            # Out-of-stock counts only ever look at active products
+            models.Index(
+                fields=['stock'],
+                condition=models.Q(is_active=True),
+                name='product_active_stock_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.name_uz
@@ -115,6 +123,13 @@ class Product(models.Model):
     @property
     def primary_image(self):
         """Get the primary image for this product"""
+        if 'images' in getattr(self, '_prefetched_objects_cache', {}):
+            # Pick from prefetched images instead of querying again
+            images = self.images.all()
+            return next(
+                (image for image in images if image.is_primary),
+                images[0] if images else None,
+            )
         primary = self.images.filter(is_primary=True).first()
         if primary:
             return primary
@@ -176,10 +191,30 @@ class ProductImage(models.Model):
         ordering = ['order', 'created_at']
         verbose_name = "Mahsulot rasmi"
         verbose_name_plural = "Mahsulot rasmlari"
+        constraints = [
+            # save(), upload_image and set_primary_image demote the old primary first
+            models.UniqueConstraint(
+                fields=['product'],
+                condition=models.Q(is_primary=True),
+                name='one_primary_image_per_product',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.product.name_uz} - Image {self.order}"
 
+    def get_constraints(self):
+        # Forms (admin inline, change form, list_editable) may tick a new primary
+        # image: save() demotes the old one first, so full_clean() skips this
+        # constraint. The database still enforces it for concurrent writes.
+        return [
+            (model, [
+                constraint for constraint in constraints
+                if constraint.name != 'one_primary_image_per_product'
+            ])
+            for model, constraints in super().get_constraints()
+        ]
+    
     def save(self, *args, **kwargs):
         # If this is marked as primary, unmark all other images for this product
         if self.is_primary:
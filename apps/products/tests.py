@@ -2,7 +2,7 @@ from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from decimal import Decimal
-from .models import Product, ProductCategory, ProductTag
+from .models import Product, ProductCategory, ProductTag, ProductImage
 
 
 class ProductCategoryModelTest(TestCase):
@@ -223,3 +223,31 @@ class ProductModelTest(TestCase):
         self.assertIsNone(product.description_en)
         self.assertIsNone(product.sale_price)
         self.assertEqual(product.tags.count(), 0)
+    
+    def test_primary_image_uses_prefetched_images(self):
+        """Oldindan yuklangan rasmlardan asosiy rasm so'rovsiz olinadi"""
+        product = Product.objects.create(**self.product_data)
+        ProductImage.objects.create(product=product, image='products/first.jpg', order=0)
+        primary = ProductImage.objects.create(
+            product=product, image='products/primary.jpg', order=1, is_primary=True
+        )
+        
+        product = Product.objects.prefetch_related('images').get(pk=product.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(product.primary_image, primary)
+            self.assertEqual(product.image_count, 2)
+    
+    def test_new_primary_image_passes_full_clean(self):
+        """Yangi asosiy rasm formada tekshiruvdan o'tadi, save() eskisini bekor qiladi"""
+        product = Product.objects.create(**self.product_data)
+        old = ProductImage.objects.create(
+            product=product, image='products/old.jpg', is_primary=True
+        )
+        new = ProductImage(product=product, image='products/new.jpg', is_primary=True)
+        
+        new.full_clean()
+        new.save()
+        
+        old.refresh_from_db()
+        self.assertFalse(old.is_primary)
+        self.assertTrue(new.is_primary)
@@ -140,6 +140,12 @@ DATABASES = {
     }
 }
 
+# Sessions
+# Kept on the database: the default cache is per-process (LocMemCache), so a
+# cached_db session flushed by one gunicorn worker would stay valid on the others
+
+SESSION_ENGINE = "django.contrib.sessions.backends.db"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators